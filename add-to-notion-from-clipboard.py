@@ -10,11 +10,33 @@
 # @raycast.packageName Notion Tools
 
 # Documentation:
-# @raycast.description Add clipboard text as a task to your Notion database
+# @raycast.description Add clipboard text as a task to your Notion database (one task per line for multi-line text)
 # @raycast.author Jesse Gilbert
 
+# Hand off to the resident script daemon if it's running (see utils/daemon.py)
+from utils.daemon import forward
+forward(__file__)
+
 import sys
-from utils import get_clipboard_content, add_task_to_notion
+from datetime import datetime
+from utils import get_clipboard_content, add_task_to_notion, add_tasks_to_notion, parse_task_line
+
+def add_tasks_from_lines(lines):
+  """Create one task per line (trailing dates become due dates) and print a summary."""
+  now = datetime.now()
+  tasks = [parse_task_line(line, now=now) for line in lines]
+  results = add_tasks_to_notion(tasks)
+
+  added = 0
+  for (task_name, _), (success, url, error) in zip(tasks, results):
+    if success:
+      added += 1
+      print(f"✅ {task_name}: {url}")
+    else:
+      print(f"❌ {task_name}: {error}")
+
+  print(f"Added {added}/{len(tasks)} tasks")
+  return added == len(tasks)
 
 def main():
   clipboard_content = get_clipboard_content()
@@ -22,7 +44,11 @@ def main():
     sys.exit(1)
   
   if clipboard_content['type'] == 'text':
-    success = add_task_to_notion(clipboard_content['content'])
+    lines = [line for line in clipboard_content['content'].splitlines() if line.strip()]
+    if len(lines) > 1:
+      success = add_tasks_from_lines(lines)
+    else:
+      success, _ = add_task_to_notion(clipboard_content['content'])
     if not success:
       sys.exit(1)
   else:
@@ -11,11 +11,17 @@
 # @raycast.packageName Notion Tools
 
 # Documentation:
-# @raycast.description Add a task to your Notion database
+# @raycast.description Add a task to your Notion database (queued locally, sent in the background)
 # @raycast.author Jesse Gilbert
 
+# Hand off to the resident script daemon if it's running (see utils/daemon.py)
+from utils.daemon import forward
+forward(__file__)
+
 import sys
 from utils import parse_date, add_task_to_notion, copy_to_clipboard
+from utils.notion import format_task
+from utils.spool import enqueue_task, start_background_flush
 
 def main():
   # Get command line arguments
@@ -25,6 +31,20 @@ def main():
   # Parse date if provided
   parsed_date = parse_date(date) if date else None
   
+  # Queue the task locally and let a background flusher create it (and
+  # notify with the page URL), so a network blip can't lose it
+  try:
+    enqueue_task(task, parsed_date)
+  except Exception as e:
+    print(f"Couldn't queue task ({e}), adding directly")
+  else:
+    try:
+      start_background_flush()
+    except OSError as e:
+      print(f"Task queued but flusher didn't start ({e}); run `python -m utils.spool flush`")
+    print(f"✅ {format_task(task, parsed_date)}")
+    return
+  
   # Add task to Notion
   success, task_url = add_task_to_notion(task, parsed_date)
   
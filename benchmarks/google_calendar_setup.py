@@ -0,0 +1,98 @@
+#!/Users/jesenator/Documents/raycast/.venv/bin/python
+
+"""Google Calendar setup latency for create-calendar-event.
+
+Spawns a fresh interpreter per sample and times what the script does before
+it can insert an event: importing Google's libraries, loading credentials
+from token.json and building the Calendar client. "before" is the flow the
+script used to run inline (build() with default arguments); "after" is
+utils.google_calendar, cold and then warm (a second run in the same
+process, as under the script daemon). Uses a throwaway token that doesn't
+need refreshing, so nothing here touches the network; the LLM call and the
+insert request itself aren't included.
+
+  .venv/bin/python benchmarks/google_calendar_setup.py [--runs 5]
+"""
+
+import argparse
+import datetime
+import json
+import os
+import statistics
+import subprocess
+import sys
+import tempfile
+
+REPO_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+# Each sample prints {"total": ..., "warm": ...} in seconds
+BEFORE = """
+import json, sys, time
+start = time.perf_counter()
+from google.oauth2.credentials import Credentials
+from google_auth_oauthlib.flow import InstalledAppFlow
+from google.auth.transport.requests import Request
+from googleapiclient.discovery import build
+with open(sys.argv[2]) as token_file:
+  creds = Credentials.from_authorized_user_info(json.load(token_file))
+assert creds.valid
+service = build('calendar', 'v3', credentials=creds)
+print(json.dumps({'total': time.perf_counter() - start, 'warm': None}))
+"""
+
+AFTER = """
+import json, sys, time
+sys.path.insert(0, sys.argv[1])
+start = time.perf_counter()
+from utils.google_calendar import get_service
+get_service()
+total = time.perf_counter() - start
+start = time.perf_counter()
+get_service()
+print(json.dumps({'total': total, 'warm': time.perf_counter() - start}))
+"""
+
+def write_fixtures(directory):
+  """A client secret and a token valid for another day, in directory."""
+  secret_path = os.path.join(directory, 'client_secret.json')
+  token_path = os.path.join(directory, 'token.json')
+  with open(secret_path, 'w') as f:
+    json.dump({'installed': {'client_id': 'benchmark', 'client_secret': 'benchmark'}}, f)
+  expiry = datetime.datetime.now(datetime.timezone.utc).replace(tzinfo=None) + datetime.timedelta(days=1)
+  with open(token_path, 'w') as f:
+    json.dump({
+      'token': 'benchmark', 'refresh_token': 'benchmark', 'client_id': 'benchmark',
+      'client_secret': 'benchmark', 'token_uri': 'https://oauth2.googleapis.com/token',
+      'scopes': ['https://www.googleapis.com/auth/calendar.events'],
+      'expiry': expiry.isoformat() + 'Z',
+    }, f)
+  return secret_path, token_path
+
+def sample(code, token_path, env, runs):
+  samples = []
+  for _ in range(runs):
+    result = subprocess.run(
+      [sys.executable, '-c', code, REPO_DIR, token_path],
+      capture_output=True, text=True, env=env, check=True
+    )
+    samples.append(json.loads(result.stdout))
+  return samples
+
+def main():
+  parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+  parser.add_argument('--runs', type=int, default=5)
+  args = parser.parse_args()
+
+  with tempfile.TemporaryDirectory() as directory:
+    secret_path, token_path = write_fixtures(directory)
+    env = dict(os.environ, GOOGLE_CREDENTIALS_PATH=secret_path, GOOGLE_TOKEN_PATH=token_path)
+    before = sample(BEFORE, token_path, env, args.runs)
+    after = sample(AFTER, token_path, env, args.runs)
+
+  print(f"Google setup before an insert (median of {args.runs}):")
+  print(f"  before (inline, build() per run)  {statistics.median(s['total'] for s in before) * 1000:7.1f} ms")
+  print(f"  after, cold                       {statistics.median(s['total'] for s in after) * 1000:7.1f} ms")
+  print(f"  after, warm (daemon)              {statistics.median(s['warm'] for s in after) * 1000:7.2f} ms")
+
+if __name__ == "__main__":
+  main()
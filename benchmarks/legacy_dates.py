@@ -0,0 +1,150 @@
+"""parse_date as it was before the table-driven rewrite, kept as the reference
+benchmarks/parse_date.py checks the new parser against. Do not edit.
+"""
+
+import re
+from datetime import datetime, timedelta
+
+# ------------------- Date Functions -------------------
+
+def parse_date(date_str):
+  """Parse date string into ISO format date or datetime string."""
+  if not date_str:
+    return None
+
+  try:
+    s = date_str.strip().lower()
+    now = datetime.now()
+
+    # Handle dot notation: "." = nearest half hour, ".1" = +1 hour, ".2" = +2 hours, etc.
+    if s.startswith('.'):
+      minute = (now.minute + 15) // 30 * 30
+      dt = now.replace(minute=minute % 60, second=0, microsecond=0)
+      if minute >= 60:
+        dt += timedelta(hours=1)
+      if s[1:]:
+        dt += timedelta(hours=int(s[1:]))
+      return dt.astimezone().isoformat(timespec='milliseconds')
+
+    # Handle date + time combo (e.g., "thu 8pm", "9 9am", "tomorrow 3:30pm")
+    last_space = s.rfind(' ')
+    if last_space > 0:
+      date_part = s[:last_space].strip()
+      time_part = s[last_space+1:].strip()
+      tm = re.match(r'^(\d{1,2})(?::(\d{2}))?\s*(am|pm|a|p)$', time_part)
+      ampm = tm.group(3) if tm else None
+      if not tm:
+        tm = re.match(r'^(\d{1,2}):(\d{2})$', time_part)
+      if tm:
+        hour = int(tm.group(1))
+        minute = int(tm.group(2) or 0)
+        if ampm and ampm.startswith('p') and hour < 12:
+          hour += 12
+        if ampm and ampm.startswith('a') and hour == 12:
+          hour = 0
+        base_date = parse_date(date_part)
+        if base_date and 'T' not in base_date:
+          dt = datetime.strptime(base_date, '%Y-%m-%d')
+          dt = dt.replace(hour=hour, minute=minute, second=0, microsecond=0)
+          return dt.astimezone().isoformat(timespec='milliseconds')
+
+    # Handle special keyword dates
+    if s == 'now' or s == 'n':
+      minute = (now.minute + 14) // 15 * 15
+      dt = now.replace(minute=minute if minute < 60 else 0, second=0, microsecond=0)
+      if minute == 60:
+        dt += timedelta(hours=1)
+      return dt.astimezone().isoformat(timespec='milliseconds')
+    elif s == 'today':
+      return now.strftime('%Y-%m-%d')
+    if s in {'tomorrow', 'tmr', 'tmrw'}:
+      return (now + timedelta(days=1)).strftime('%Y-%m-%d')
+    if s == 'later':
+      return (now + timedelta(days=5)).strftime('%Y-%m-%d')
+
+    # Handle numeric input as days from now
+    if s.isdigit():
+      return (now + timedelta(days=int(s))).strftime('%Y-%m-%d')
+
+    # Handle time formats (12:30am, 5:00pm, etc.)
+    m = re.match(r'^(\d{1,2}):?(\d{2})?\s*(am|pm|a|p)?$', s)
+    if m:
+      hour = int(m.group(1))
+      minute = int(m.group(2) or 0)
+      ampm = m.group(3)
+      if ampm and ampm.startswith('p') and hour < 12:
+        hour += 12
+      if ampm and ampm.startswith('a') and hour == 12:
+        hour = 0
+      dt = now.replace(hour=hour, minute=minute, second=0, microsecond=0)
+      if dt < now:
+        dt += timedelta(days=1)
+      return dt.astimezone().isoformat(timespec='milliseconds')
+
+    weekdays = {
+      'monday': 0, 'mon': 0,
+      'tuesday': 1, 'tue': 1, 'tues': 1,
+      'wednesday': 2, 'wed': 2, 'weds': 2,
+      'thursday': 3, 'thu': 3, 'thur': 3, 'thurs': 3,
+      'friday': 4, 'fri': 4,
+      'saturday': 5, 'sat': 5,
+      'sunday': 6, 'sun': 6
+    }
+
+    # Count "next"/"n" prefixes and extract the remaining day name
+    # e.g. "next saturday" -> 1 extra week, "n n wed" -> 2 extra weeks
+    parts = s.split()
+    next_count = 0
+    for p in parts:
+      if p in ('next', 'n'):
+        next_count += 1
+      else:
+        break
+    remainder = ' '.join(parts[next_count:])
+
+    if next_count > 0 and remainder in weekdays:
+      days_ahead = (weekdays[remainder] - now.weekday()) % 7
+      days_ahead += 7 * next_count
+      return (now + timedelta(days=days_ahead)).strftime('%Y-%m-%d')
+
+    # Handle weekday names (no "next" prefix) -- resolves to today if it's that day
+    if s in weekdays:
+      days_ahead = (weekdays[s] - now.weekday()) % 7
+      return (now + timedelta(days=days_ahead)).strftime('%Y-%m-%d')
+
+    # Handle month-name date formats: June 15, Jun 15th, 15 June, June 15 2027
+    ordinal_s = re.sub(r'\b(\d{1,2})(st|nd|rd|th)\b', r'\1', s)
+    month_formats = (
+      '%B %d %Y', '%b %d %Y',
+      '%B %d, %Y', '%b %d, %Y',
+      '%B %d', '%b %d',
+      '%d %B %Y', '%d %b %Y',
+      '%d %B', '%d %b'
+    )
+    for fmt in month_formats:
+      try:
+        dt = datetime.strptime(ordinal_s, fmt)
+        if '%Y' not in fmt:
+          dt = dt.replace(year=now.year)
+          if dt.date() < now.date():
+            dt = dt.replace(year=now.year + 1)
+        return dt.strftime('%Y-%m-%d')
+      except ValueError:
+        pass
+
+    # Handle standard date formats
+    for fmt in ('%Y-%m-%d', '%m/%d/%Y', '%m/%d', '%m-%d'):
+      try:
+        dt = datetime.strptime(date_str, fmt)
+        if fmt in ('%m/%d', '%m-%d'):
+          dt = dt.replace(year=now.year)
+          if dt < now:
+            dt = dt.replace(year=now.year + 1)
+        return dt.strftime('%Y-%m-%d')
+      except ValueError:
+        pass
+
+    return None
+  except Exception as e:
+    print(f"Error parsing date '{date_str}': {str(e)}")
+    return None
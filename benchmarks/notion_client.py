@@ -0,0 +1,144 @@
+#!/Users/jesenator/Documents/raycast/.venv/bin/python
+
+"""Connection-reuse and rate-limit check for utils.notion's NotionClient.
+
+Starts a local stand-in for the Notion API that answers the first page
+create with 429 and a Retry-After, then adds a burst of tasks through
+add_task_to_notion with a NotionClient pointed at it. Exits 1 unless every
+add succeeds over a single keep-alive connection and the 429 was retried no
+sooner than its Retry-After. Then times a burst without 429s through the
+client and through a bare requests.post per add (what add_task_to_notion
+used to do), which opens a connection per task. The stand-in speaks plain
+HTTP on localhost, so the timings leave out the TLS handshake that pooling
+saves against the real API.
+
+  .venv/bin/python benchmarks/notion_client.py [--adds 20] [--retry-after 0.3]
+"""
+
+import argparse
+import contextlib
+import io
+import json
+import os
+import sys
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+REPO_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, REPO_DIR)
+
+from utils.notion import NotionClient, add_task_to_notion, build_task_page
+
+class StandIn(ThreadingHTTPServer):
+  """Fake Notion that rate-limits the first `limited` page creates."""
+
+  daemon_threads = True
+
+  def __init__(self, limited=1, retry_after=0.3):
+    super().__init__(('127.0.0.1', 0), StandInHandler)
+    self.limited = limited
+    self.retry_after = retry_after
+    self.connections = 0
+    self.requests = []  # (monotonic time, status) per page create
+    self.lock = threading.Lock()
+
+  @property
+  def url(self):
+    return f"http://127.0.0.1:{self.server_address[1]}/v1"
+
+class StandInHandler(BaseHTTPRequestHandler):
+  protocol_version = 'HTTP/1.1'  # keep-alive
+  # Headers and body go out in separate writes; without this, delayed ACKs add
+  # ~40 ms to every response on a reused connection
+  disable_nagle_algorithm = True
+
+  def setup(self):
+    super().setup()
+    with self.server.lock:
+      self.server.connections += 1
+
+  def log_message(self, *args):
+    pass
+
+  def do_POST(self):
+    self.rfile.read(int(self.headers.get('Content-Length', 0)))
+    with self.server.lock:
+      limited = self.server.limited > 0
+      self.server.limited -= limited
+      status = 429 if limited else 200
+      self.server.requests.append((time.monotonic(), status))
+      page_id = f"page-{len(self.server.requests)}"
+    body = json.dumps({'message': 'Rate limited'} if limited else {'id': page_id}).encode()
+    self.send_response(status)
+    if limited:
+      self.send_header('Retry-After', str(self.server.retry_after))
+    self.send_header('Content-Type', 'application/json')
+    self.send_header('Content-Length', str(len(body)))
+    self.end_headers()
+    self.wfile.write(body)
+
+def serve(**kwargs):
+  server = StandIn(**kwargs)
+  threading.Thread(target=server.serve_forever, daemon=True).start()
+  return server
+
+def check(adds, retry_after):
+  """Run the burst through NotionClient; return a list of failed checks."""
+  server = serve(retry_after=retry_after)
+  client = NotionClient(token='test', base_url=server.url)
+  with contextlib.redirect_stdout(io.StringIO()):
+    results = [add_task_to_notion(f"Task {i}", client=client) for i in range(adds)]
+  client.close()
+  server.shutdown()
+
+  (limited_at, _), (retried_at, _) = server.requests[:2]
+  print(f"{adds} adds over {server.connections} connection(s), "
+        f"429 retried after {retried_at - limited_at:.2f}s (Retry-After {retry_after}s)")
+
+  failures = []
+  if not all(success and url for success, url in results):
+    failures.append(f"{sum(not success for success, _ in results)} add(s) failed")
+  if server.connections != 1:
+    failures.append(f"expected 1 connection, got {server.connections}")
+  if len(server.requests) != adds + 1:
+    failures.append(f"expected {adds + 1} requests (one retry), got {len(server.requests)}")
+  if retried_at - limited_at < retry_after:
+    failures.append(f"retried {retried_at - limited_at:.2f}s after the 429, before its Retry-After")
+  return failures
+
+def time_burst(adds, pooled):
+  """Time adds without 429s; returns (seconds, connections opened)."""
+  import requests
+
+  server = serve(limited=0)
+  client = NotionClient(token='test', base_url=server.url)
+  start = time.perf_counter()
+  for i in range(adds):
+    if pooled:
+      client.create_page(build_task_page(f"Task {i}"))
+    else:
+      requests.post(f"{server.url}/pages", json=build_task_page(f"Task {i}"), headers={"Authorization": "Bearer test"})
+  seconds = time.perf_counter() - start
+  client.close()
+  server.shutdown()
+  return seconds, server.connections
+
+def main():
+  parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+  parser.add_argument('--adds', type=int, default=20)
+  parser.add_argument('--retry-after', type=float, default=0.3, help='Seconds the stand-in asks clients to wait')
+  args = parser.parse_args()
+
+  failures = check(args.adds, args.retry_after)
+  if failures:
+    print(f"\n❌ {'; '.join(failures)}")
+    sys.exit(1)
+  print("✅ One connection for every add, and the 429 was retried after its Retry-After\n")
+
+  for name, pooled in (('NotionClient', True), ('requests.post', False)):
+    seconds, connections = time_burst(args.adds, pooled)
+    print(f"  {name:<14} {args.adds} adds in {seconds * 1000:6.1f} ms over {connections} connection(s)")
+
+if __name__ == "__main__":
+  main()
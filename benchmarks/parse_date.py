@@ -0,0 +1,154 @@
+#!/Users/jesenator/Documents/raycast/.venv/bin/python
+
+"""Equivalence check and micro-benchmark for utils.dates.parse_date.
+
+First runs every input in a generated corpus through both the current parser
+and the pre-rewrite one (benchmarks/legacy_dates.py) under a set of frozen
+clocks, and exits 1 if any result differs, or if parse_dates disagrees with
+parse_date. Then times both parsers per call, grouped by the kind of input,
+since the month-name and numeric formats used to be the slowest path, and
+measures parse_dates throughput on a large pasted batch.
+
+  .venv/bin/python benchmarks/parse_date.py [--number 2000] [--check-only]
+"""
+
+import argparse
+import contextlib
+import io
+import itertools
+import os
+import sys
+import time
+from datetime import datetime
+
+REPO_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, REPO_DIR)
+
+import legacy_dates
+from utils.dates import parse_date, parse_dates
+
+# Clocks chosen to land on rounding, day, month, year and leap-day boundaries
+CLOCKS = [
+  datetime(2026, 10, 18, 14, 7, 31, 250000),
+  datetime(2026, 10, 18, 23, 53, 2),
+  datetime(2026, 12, 31, 23, 46, 59),
+  datetime(2027, 1, 1, 0, 0, 0),
+  datetime(2028, 2, 28, 11, 44, 0),
+  datetime(2028, 2, 29, 12, 15, 0),
+  datetime(2026, 3, 9, 0, 29, 59),
+  datetime(2026, 6, 15, 9, 30, 0),
+]
+
+MONTHS = ['january', 'jan', 'june', 'jun', 'may', 'sept', 'sep', 'february', 'feb', 'December', 'dec', 'smarch']
+TIMES = ['8pm', '9am', '3:30pm', '12am', '12pm', '12:05a', '0:15', '23:59', '7 p', '13pm', '25:00', '9:60', '5:5pm']
+
+CATEGORIES = {
+  'keywords': ['today', 'tomorrow', 'tmr', 'tmrw', 'later', 'now', 'n', ' Today ', 'TMRW'],
+  'dot notation': ['.', '.1', '.2', '.12', '.-1', '.x', '. 3'],
+  'days from now': ['0', '1', '7', '30', '365', '1230', '99999999', '²'],
+  'times': ['5pm', '5:30pm', '1230pm', '530', '12:', '12am', '12 pm', '0a', '23:59', '24:00', '9:7', '10p', '7:45 am'],
+  'weekdays': ['mon', 'tues', 'weds', 'thurs', 'friday', 'sun', 'next fri', 'n wed', 'n n wed', 'next  next sat', 'next', 'next n'],
+  'combos': [
+    f'{day} {clock}' for day in ['thu', 'tomorrow', 'today', '9', 'next mon', 'june 15', '2026-11-02', '11/2', 'now', 'blah']
+    for clock in TIMES
+  ] + ['thu 8pm 9pm', '. 3pm', 'n 5pm', '12/25\t9am'],
+  'month names': [
+    f'{month}{sep}{day}{suffix}{year}'
+    for month in MONTHS
+    for day in ['1', '01', '3', '15', '29', '30', '31', '32', '0']
+    for suffix in ['', 'th', 'rd']
+    for sep, year in [(' ', ''), (' ', ' 2027'), (' ', ', 2027'), ('  ', ' 0000')]
+  ] + [
+    f'{day}{suffix} {month}{year}'
+    for month in MONTHS
+    for day in ['1', '15', '29', '31']
+    for suffix in ['', 'st', 'th']
+    for year in ['', ' 2028', ' 2027']
+  ] + ['june 15,2027', 'JUNE 15', 'jun 15 27', '15 jun, 2027', 'june  5', 'feb 29 2028', 'feb 29', '3rd of june'],
+  'numeric dates': [
+    f'{m}{sep}{d}{year}'
+    for m in ['1', '01', '2', '10', '12', '13', '0']
+    for d in ['1', '05', '18', '29', '30', '31', ' 5']
+    for sep, year in [('/', ''), ('-', ''), ('/', '/2027'), ('/', '/27')]
+  ] + ['2026-10-18', '2027-02-29', '2028-02-29', '0000-01-01', '2026-13-01', ' 2026-10-18', '2026-10-18 ', '2026/10/18', '10.18'],
+  'unparseable': ['', '   ', 'someday', 'next week', 'in 3 days', 'fri fri', '5 pmm', 'ASAP', 'the 15th'],
+}
+
+def frozen_datetime(now):
+  """datetime subclass whose now() always returns `now`."""
+  class FrozenDatetime(datetime):
+    @classmethod
+    def now(cls, tz=None):
+      return now
+  return FrozenDatetime
+
+def legacy_parse(date_str, now):
+  legacy_dates.datetime = frozen_datetime(now)
+  # The legacy parser prints errors for invalid input, as does the new one
+  with contextlib.redirect_stdout(io.StringIO()):
+    return legacy_dates.parse_date(date_str)
+
+def current_parse(date_str, now):
+  with contextlib.redirect_stdout(io.StringIO()):
+    return parse_date(date_str, now=now)
+
+def check():
+  """Compare both parsers on every input under every clock. Returns the mismatches."""
+  inputs = list(itertools.chain.from_iterable(CATEGORIES.values()))
+  mismatches = []
+  for now in CLOCKS:
+    for date_str in inputs:
+      expected = legacy_parse(date_str, now)
+      actual = current_parse(date_str, now)
+      if expected != actual:
+        mismatches.append((now, date_str, expected, actual))
+    for parsed in parse_dates(inputs, now=now):
+      expected = current_parse(parsed.text, now)
+      if parsed.value != expected or (parsed.value is None) != (parsed.error is not None):
+        mismatches.append((now, parsed.text, expected, f"parse_dates: {parsed}"))
+  return len(inputs) * len(CLOCKS), mismatches
+
+def time_per_call(parse, inputs, number):
+  """Mean seconds per call over `number` passes through inputs."""
+  with contextlib.redirect_stdout(io.StringIO()):
+    start = time.perf_counter()
+    for _ in range(number):
+      for date_str in inputs:
+        parse(date_str)
+    return (time.perf_counter() - start) / (number * len(inputs))
+
+def main():
+  parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+  parser.add_argument('--number', type=int, default=200, help='Passes over each category')
+  parser.add_argument('--check-only', action='store_true')
+  args = parser.parse_args()
+
+  checked, mismatches = check()
+  for now, date_str, expected, actual in mismatches[:20]:
+    print(f"{now:%Y-%m-%d %H:%M:%S}  {date_str!r}: legacy {expected!r}, current {actual!r}")
+  if mismatches:
+    print(f"\n❌ {len(mismatches)} of {checked} results differ from the legacy parser")
+    sys.exit(1)
+  print(f"✅ {checked} results identical to the legacy parser across {len(CLOCKS)} clocks\n")
+  if args.check_only:
+    return
+
+  # Both parsers read the real clock here, as they do in the scripts
+  legacy_dates.datetime = datetime
+  print(f"{'inputs':<16} {'legacy':>10} {'current':>10} {'speedup':>8}")
+  for name, inputs in CATEGORIES.items():
+    before = time_per_call(legacy_dates.parse_date, inputs, args.number)
+    after = time_per_call(parse_date, inputs, args.number)
+    print(f"{name:<16} {before * 1e6:8.1f}µs {after * 1e6:8.1f}µs {before / after:7.1f}x")
+
+  # A pasted schedule repeats most of its dates, which parse_dates only parses once
+  inputs = list(itertools.chain.from_iterable(CATEGORIES.values()))
+  batch = [inputs[i % len(inputs)] for i in range(0, 50 * len(inputs), 7)]
+  start = time.perf_counter()
+  unparsed = sum(parsed.error is not None for parsed in parse_dates(batch))
+  elapsed = time.perf_counter() - start
+  print(f"\nparse_dates: {len(batch)} strings ({len(set(batch))} distinct, {unparsed} unparsed) "
+        f"in {elapsed * 1000:.1f} ms, {len(batch) / elapsed:,.0f}/s")
+
+if __name__ == "__main__":
+  main()
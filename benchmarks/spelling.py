@@ -0,0 +1,194 @@
+#!/Users/jesenator/Documents/raycast/.venv/bin/python
+
+"""Spell-checker benchmark for fix-spelling's single-word path.
+
+Cold start: spawns a fresh interpreter per sample that loads the English
+dictionary and corrects one word, once with pyspellchecker's SpellChecker()
+(what fix-spelling used to build at import) and once with utils.spelling's
+memory-mapped indexes, and reports wall time and peak RSS for each.
+
+Corrections: corrects every typo in benchmarks/typos.txt with both, and
+reports per-word latency, how often the two agree (on the correction and on
+the whole candidate set), and how often each returns the intended word.
+
+Local pass: runs fix_text (what fix-spelling tries before the LLM) and
+fix_word (its single-word path) over the typos, reporting how many each fixes
+itself and how many of those are right, and over the valid-but-unknown words
+in benchmarks/unknown_words.txt (slang, brands, British spellings),
+mid-sentence, starting one and alone. Exits 1 if any of those is rewritten
+instead of being sent to the LLM.
+
+The indexes are built, in a separate process, before anything is measured.
+
+  .venv/bin/python benchmarks/spelling.py [--runs 5] [--word recieve] [--typos FILE] [--unknown FILE]
+"""
+
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+import time
+
+REPO_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, REPO_DIR)
+
+# Each prints {"seconds": ..., "rss": ..., "correction": ...}; ru_maxrss is KB on
+# Linux and bytes on macOS
+SAMPLE = """
+import json, resource, sys, time
+start = time.perf_counter()
+sys.path.insert(0, sys.argv[1])
+{load}
+correction = {correct}(sys.argv[2])
+seconds = time.perf_counter() - start
+rss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss * (1 if sys.platform == 'darwin' else 1024)
+print(json.dumps({{'seconds': seconds, 'rss': rss, 'correction': correction}}))
+"""
+
+CHECKERS = {
+  'pyspellchecker': ("from spellchecker import SpellChecker\nspell = SpellChecker()", "spell.correction"),
+  'mmap index': ("from utils.spelling import get_dictionary\nspell = get_dictionary()", "spell.correction"),
+  'no checker': ("", "str"),
+}
+
+def cold_start(load, correct, word, runs):
+  """Return (median seconds, median peak RSS bytes, correction) over fresh interpreters."""
+  samples = []
+  for _ in range(runs):
+    result = subprocess.run(
+      [sys.executable, '-c', SAMPLE.format(load=load, correct=correct), REPO_DIR, word],
+      capture_output=True, text=True, check=True
+    )
+    samples.append(json.loads(result.stdout))
+  return (
+    statistics.median(s['seconds'] for s in samples),
+    statistics.median(s['rss'] for s in samples),
+    samples[0]['correction'],
+  )
+
+def load_typos(path):
+  """(typo, intended) pairs from a file of "typo intended" lines."""
+  with open(path, encoding='utf-8') as f:
+    return [tuple(line.split()) for line in f if line.strip() and not line.startswith('#')]
+
+def load_words(path):
+  with open(path, encoding='utf-8') as f:
+    return [word for line in f if not line.startswith('#') for word in line.split()]
+
+def percentile(values, p):
+  ordered = sorted(values)
+  return ordered[min(len(ordered) - 1, int(p / 100 * len(ordered)))]
+
+def time_corrections(correct, typos):
+  """Return (corrections, seconds per typo)."""
+  corrections, seconds = [], []
+  for typo, _ in typos:
+    start = time.perf_counter()
+    corrections.append(correct(typo))
+    seconds.append(time.perf_counter() - start)
+  return corrections, seconds
+
+def compare(typos):
+  from spellchecker import SpellChecker
+  from utils.spelling import get_dictionary
+  spell = SpellChecker()
+  dictionary = get_dictionary()
+  # Touch every typo once so page faults on the index don't count as lookup time
+  for typo, _ in typos:
+    dictionary.correction(typo)
+
+  results = {}
+  for name, correct in (('pyspellchecker', spell.correction), ('deletes index', dictionary.correction)):
+    results[name] = time_corrections(correct, typos)
+    corrections, seconds = results[name]
+    right = sum(c == intended for c, (_, intended) in zip(corrections, typos))
+    micros = [s * 1e6 for s in seconds]
+    print(f"  {name:<18} median {statistics.median(micros):9.1f}µs  p90 {percentile(micros, 90):9.1f}µs  "
+          f"max {max(micros):9.1f}µs  intended word {right}/{len(typos)}")
+
+  expected, _ = results['pyspellchecker']
+  actual, _ = results['deletes index']
+  same = sum(a == b for a, b in zip(expected, actual))
+  same_candidates = sum((spell.candidates(typo) or set()) == dictionary.candidates(typo) for typo, _ in typos)
+  print(f"\n  agreement: correction {same}/{len(typos)}, candidate sets {same_candidates}/{len(typos)}")
+  for (typo, _), a, b in zip(typos, expected, actual):
+    if a != b:
+      print(f"    {typo}: pyspellchecker {a!r}, deletes index {b!r}")
+
+def local_pass(typos, unknown_words):
+  """Check fix_text and fix_word on typos and on valid words they don't know. Returns the words they rewrote."""
+  from utils.spelling import fix_text, fix_word, get_dictionary
+  dictionary = get_dictionary()
+
+  fixed = right = 0
+  for typo, intended in typos:
+    result = fix_text(f"so {typo} now", dictionary)
+    if result.confident:
+      fixed += 1
+      right += result.text == f"so {intended} now"
+  print(f"  typos: {fixed}/{len(typos)} fixed locally, {right} of them to the intended word, "
+        f"{len(typos) - fixed} left for the LLM (or already known words)")
+  alone = [(fix_word(typo, dictionary), intended) for typo, intended in typos]
+  print(f"  typos alone (fix_word): {sum(bool(fix) for fix, _ in alone)}/{len(typos)} fixed locally, "
+        f"{sum(fix == intended for fix, intended in alone)} of them to the intended word")
+
+  rewritten = []
+  escalated = 0
+  for word in unknown_words:
+    # Mid-sentence and starting a sentence
+    for text in (f"the {word} thing", f"{word[0].upper()}{word[1:]} is down"):
+      result = fix_text(text, dictionary)
+      if result.changes:
+        rewritten.append((text, result.text))
+      else:
+        escalated += 1
+    # Alone, as fix-spelling's single-word path sees it
+    fix = fix_word(word, dictionary)
+    if fix:
+      rewritten.append((word, fix))
+    else:
+      escalated += 1
+  print(f"  valid unknown words: {len(unknown_words)} words in {3 * len(unknown_words)} texts, "
+        f"{escalated} sent to the LLM, {len(rewritten)} rewritten")
+  for before, after in rewritten:
+    print(f"    {before!r} -> {after!r}")
+  return rewritten
+
+def main():
+  parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+  parser.add_argument('--runs', type=int, default=5)
+  parser.add_argument('--word', default='recieve', help='Misspelled word to correct')
+  parser.add_argument('--typos', default=os.path.join(REPO_DIR, 'benchmarks', 'typos.txt'),
+                      help='File of "typo intended" lines')
+  parser.add_argument('--unknown', default=os.path.join(REPO_DIR, 'benchmarks', 'unknown_words.txt'),
+                      help='File of valid words the dictionary lacks')
+  args = parser.parse_args()
+
+  # Build (or validate) the indexes in a child process: Linux children inherit
+  # the parent's ru_maxrss, so loading them here would inflate every cold-start
+  # sample's peak RSS
+  from utils.spelling import DELETES_PATH, INDEX_PATH
+  start = time.perf_counter()
+  subprocess.run([sys.executable, '-m', 'utils.spelling', 'build'], cwd=REPO_DIR, capture_output=True, check=True)
+  print(f"indexes ready in {time.perf_counter() - start:.2f}s: {INDEX_PATH} ({os.path.getsize(INDEX_PATH) / 1e6:.1f} MB), "
+        f"{DELETES_PATH} ({os.path.getsize(DELETES_PATH) / 1e6:.1f} MB)\n")
+
+  print(f"Cold start, load + correct {args.word!r} (median of {args.runs}):")
+  for name, (load, correct) in CHECKERS.items():
+    seconds, rss, correction = cold_start(load, correct, args.word, args.runs)
+    print(f"  {name:<18} {seconds * 1000:7.1f} ms  peak RSS {rss / 2**20:6.1f} MB  -> {correction}")
+
+  typos = load_typos(args.typos)
+  print(f"\nCorrecting {len(typos)} typos from {os.path.relpath(args.typos, REPO_DIR)}:")
+  compare(typos)
+
+  print("\nLocal pass (fix_text):")
+  if local_pass(typos, load_words(args.unknown)):
+    print("\n❌ The local pass rewrote valid words instead of leaving them to the LLM")
+    sys.exit(1)
+  print("\n✅ Every valid unknown word was sent to the LLM")
+
+if __name__ == "__main__":
+  main()
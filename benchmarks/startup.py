@@ -0,0 +1,91 @@
+#!/Users/jesenator/Documents/raycast/.venv/bin/python
+
+"""Cold-start benchmark for the Python hotkey scripts.
+
+Spawns a fresh interpreter per sample and loads each script without calling
+main(), so the number is interpreter start + imports + module-level setup,
+which is what a Raycast hotkey pays before doing any real work. Exits 1 if
+any script's median goes over its budget.
+
+  .venv/bin/python benchmarks/startup.py [--runs 5] [--budget 0.15] [script.py ...]
+"""
+
+import argparse
+import os
+import statistics
+import subprocess
+import sys
+import time
+
+REPO_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+# Default budget in seconds, with overrides for scripts that legitimately need
+# a heavy dependency at import time
+DEFAULT_BUDGET = 0.15
+BUDGETS = {}
+
+# Scripts that do their work at module level can't be loaded without running them
+SKIP = {'go-to-notion-home.py'}
+
+# Load the script under a non-__main__ name so main() doesn't run
+LOADER = """
+import runpy, sys
+sys.path.insert(0, sys.argv[2])
+try:
+  runpy.run_path(sys.argv[1], run_name='__startup__')
+except SystemExit:
+  pass
+"""
+
+def hotkey_scripts():
+  return sorted(
+    name for name in os.listdir(REPO_DIR)
+    if name.endswith('.py') and name not in SKIP
+  )
+
+def time_script(path, runs):
+  """Return (median, min) wall time in seconds, or raise if the script fails to load."""
+  samples = []
+  for _ in range(runs):
+    start = time.perf_counter()
+    result = subprocess.run(
+      [sys.executable, '-c', LOADER, path, REPO_DIR],
+      capture_output=True, text=True, cwd=REPO_DIR
+    )
+    samples.append(time.perf_counter() - start)
+    if result.returncode != 0:
+      raise RuntimeError(result.stderr.strip().splitlines()[-1] if result.stderr.strip() else f"exit {result.returncode}")
+  return statistics.median(samples), min(samples)
+
+def main():
+  parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+  parser.add_argument('scripts', nargs='*', help='Scripts to measure (default: all hotkey scripts)')
+  parser.add_argument('--runs', type=int, default=5)
+  parser.add_argument('--budget', type=float, help='Override the budget (seconds) for every script')
+  args = parser.parse_args()
+
+  baseline, _ = time_script(os.devnull, args.runs)
+  print(f"{'interpreter only':<42} {baseline * 1000:7.1f} ms")
+
+  failed = []
+  for name in args.scripts or hotkey_scripts():
+    name = os.path.basename(name)
+    budget = args.budget if args.budget is not None else BUDGETS.get(name, DEFAULT_BUDGET)
+    try:
+      median, fastest = time_script(os.path.join(REPO_DIR, name), args.runs)
+    except RuntimeError as e:
+      print(f"{name:<42}   error: {e}")
+      failed.append(name)
+      continue
+    status = 'ok' if median <= budget else 'OVER BUDGET'
+    print(f"{name:<42} {median * 1000:7.1f} ms (min {fastest * 1000:.1f}, budget {budget * 1000:.0f}) {status}")
+    if median > budget:
+      failed.append(name)
+
+  if failed:
+    print(f"\n❌ {len(failed)} script(s) failed: {', '.join(failed)}")
+    sys.exit(1)
+  print("\n✅ All scripts within budget")
+
+if __name__ == "__main__":
+  main()
@@ -0,0 +1,89 @@
+#!/Users/jesenator/Documents/raycast/.venv/bin/python
+
+"""Typing-throughput benchmark for utils.keystrokes.
+
+Compiles corpora (this repo's README and scripts by default) into keystroke
+schedules and plays them in real time through the recording sink, then
+reports achieved vs target WPM, how late each keystroke landed against its
+deadline (jitter percentiles), and the per-keystroke cost of compiling and
+of the playback loop itself. Use it to tune SPEED_MULTIPLIER against real
+numbers. WPM counts five characters as a word.
+
+  .venv/bin/python benchmarks/typing_speed.py [--chars 1500] [--speed 0.1] [--seed 1] [file ...]
+"""
+
+import argparse
+import glob
+import os
+import statistics
+import sys
+import time
+
+REPO_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, REPO_DIR)
+
+from utils.keystrokes import (
+  SPEED_MULTIPLIER, Keystroke, NullSink, RecordingSink, compile_schedule, play, schedule_duration
+)
+
+def default_corpora():
+  return [os.path.join(REPO_DIR, 'README.md')] + sorted(glob.glob(os.path.join(REPO_DIR, '*.py')))[:3]
+
+def percentile(values, p):
+  ordered = sorted(values)
+  return ordered[min(len(ordered) - 1, int(p / 100 * len(ordered)))]
+
+def wpm(chars, seconds):
+  return chars / 5 / seconds * 60 if seconds > 0 else float('inf')
+
+def loop_overhead(count=20000):
+  """Seconds the playback loop spends per keystroke when no waiting is needed."""
+  schedule = [Keystroke('type', 'a', 0.0)] * count
+  start = time.perf_counter()
+  play(schedule, NullSink())
+  return (time.perf_counter() - start) / count
+
+def measure(name, text, speed, seed):
+  start = time.perf_counter()
+  schedule = compile_schedule(text, speed, seed)
+  compile_time = (time.perf_counter() - start) / max(len(schedule), 1)
+
+  sink = play(schedule, RecordingSink())
+  if sink.text != text:
+    raise RuntimeError(f"{name}: typed text doesn't match the input")
+
+  sent_at = [sent for _, _, sent in sink.sent]
+  # Keystroke 0 fires at its deadline, so lateness is measured relative to it
+  lateness = [(sent - sent_at[0]) - stroke.at for sent, stroke in zip(sent_at, schedule)]
+  lateness_ms = [late * 1000 for late in lateness]
+  expected = schedule_duration(schedule)
+  achieved = sent_at[-1] - sent_at[0]
+  print(f"{name:<32} {len(text):>6} chars {len(schedule):>6} keys  "
+        f"target {wpm(len(text), expected):6.0f} wpm  achieved {wpm(len(text), achieved):6.0f} wpm  "
+        f"late p50 {statistics.median(lateness_ms):5.2f} p90 {percentile(lateness_ms, 90):5.2f} "
+        f"p99 {percentile(lateness_ms, 99):5.2f} max {max(lateness_ms):5.2f} ms  "
+        f"compile {compile_time * 1e6:.1f}µs/key")
+  return expected, achieved
+
+def main():
+  parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+  parser.add_argument('files', nargs='*', help='Text files to type (default: README and a few scripts)')
+  parser.add_argument('--chars', type=int, default=1500, help='Characters typed from each file')
+  parser.add_argument('--speed', type=float, default=SPEED_MULTIPLIER, help='Speed multiplier to test')
+  parser.add_argument('--seed', type=int, default=1)
+  args = parser.parse_args()
+
+  print(f"speed multiplier {args.speed}, playback loop overhead {loop_overhead() * 1e6:.2f}µs/key\n")
+  total_expected = total_achieved = 0.0
+  for path in args.files or default_corpora():
+    with open(path, encoding='utf-8') as f:
+      text = f.read()[:args.chars]
+    expected, achieved = measure(os.path.basename(path), text, args.speed, args.seed)
+    total_expected += expected
+    total_achieved += achieved
+
+  drift = (total_achieved - total_expected) / total_expected * 100 if total_expected else 0.0
+  print(f"\nTotal: expected {total_expected:.2f}s, achieved {total_achieved:.2f}s ({drift:+.2f}% drift)")
+
+if __name__ == "__main__":
+  main()
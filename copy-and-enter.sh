@@ -9,26 +9,21 @@
 # @raycast.icon ⌨️
 # @raycast.description Simulate Cmd+A, Cmd+C, then Enter keypresses to save content to clipboard before submitting
 
-# Configuration
-delay_time=0.01
+# Get the directory of the current script to source utils.sh
+SCRIPT_DIR="$(cd "$(dirname "${BASH_SOURCE[0]}")" && pwd)"
+
+# Source shared utility functions
+source "$SCRIPT_DIR/utils.sh"
 
 # Get the frontmost application
 active_app=$(osascript -e 'tell application "System Events" to get name of first application process whose frontmost is true')
 
-# Simulate the keypresses
-osascript <<EOF
-tell application "System Events"
-  tell application process "$active_app"
-    keystroke "a" using command down
-    delay $delay_time
-    keystroke "c" using command down
-    delay $delay_time
-    key code 124
-    delay $delay_time
-    key code 36
-  end tell
-end tell
-EOF
+# Select all, give the app a moment to apply it, copy and wait for the copy to
+# land on the clipboard, then deselect (right arrow) and submit (return)
+keystrokes_and_wait_for_clipboard "$active_app" \
+  $'keystroke "a" using command down\n    delay 0.01\n    keystroke "c" using command down' \
+  1000 \
+  $'key code 124\n    key code 36'
 
 copied_content=$(pbpaste)
 
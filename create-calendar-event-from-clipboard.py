@@ -36,6 +36,10 @@ set up script in raycast
 - optional: set up a keyboard shortcut to run the script (I use ctrl+cmd+c)
 '''
 
+# Hand off to the resident script daemon if it's running (see utils/daemon.py)
+from utils.daemon import forward
+forward(__file__)
+
 import os
 import sys
 import json
@@ -44,14 +48,9 @@ import subprocess
 import datetime
 import re
 from dotenv import load_dotenv
-from openai import OpenAI
 from utils import get_clipboard_content
-
-# Add Google API imports
-from google.oauth2.credentials import Credentials
-from google_auth_oauthlib.flow import InstalledAppFlow
-from google.auth.transport.requests import Request
-from googleapiclient.discovery import build
+from utils.llm import complete
+from utils.google_calendar import get_service, prefetch_service
 
 # ------------------ Configuration ------------------
 # Anchor all paths to this script's directory so it works regardless of the
@@ -67,13 +66,6 @@ if not OPENROUTER_API_KEY:
   print("Error: OPENROUTER_API_KEY not found in .env file")
   sys.exit(1)
 
-# Path to store credentials
-CONFIG_DIR = SCRIPT_DIR
-CREDENTIALS_PATH = os.path.join(CONFIG_DIR, "Google Calendar Client Secret.json")
-TOKEN_PATH = os.path.join(CONFIG_DIR, "token.json")
-# Google API scope
-SCOPES = ['https://www.googleapis.com/auth/calendar.events']
-
 
 def get_local_timezone():
   """Return the system's current IANA timezone name (e.g. 'Europe/London').
@@ -116,8 +108,6 @@ Notes:
 - Your timezone: {TIMEZONE}. Return the time in this timezone.
 """
 
-  client = OpenAI(base_url="https://openrouter.ai/api/v1", api_key=OPENROUTER_API_KEY)
-  
   if content['type'] == 'text':
     messages = [{"role": "user", "content": f"{prompt}\n\nText: {content['content']}"}]
   else:
@@ -127,15 +117,12 @@ Notes:
       {"type": "image_url", "image_url": {"url": f"data:image/png;base64,{image_b64}"}}
     ]}]
   
-  response = client.chat.completions.create(model="anthropic/claude-haiku-4.5", messages=messages, temperature=0)
-  response_text = response.choices[0].message.content
-  
-  # Find JSON in response if wrapped in backticks
-  json_match = re.search(r'```json\s*(.*?)\s*```', response_text, re.DOTALL)
-  if json_match:
-    response_text = json_match.group(1)
-  
-  event_data = json.loads(response_text.replace(': null', ': ""'))
+  # Same clipboard on the same day gives the same event, so re-runs are answered
+  # from the cache (only answers that parse are cached)
+  response_text = complete(
+    messages, model="anthropic/claude-haiku-4.5", temperature=0, cache=True, validate=parse_event
+  )
+  event_data = parse_event(response_text)
   
   if event_data.get('no_event'):
     raise ValueError("No calendar event found in the clipboard content")
@@ -144,34 +131,31 @@ Notes:
   print(json.dumps(event_data, indent=2))
   return event_data
 
-def get_google_credentials():
-  """Get and refresh Google API credentials."""
-  if not os.path.exists(CREDENTIALS_PATH):
-    raise ValueError(f"Google Calendar credentials not found at {CREDENTIALS_PATH}. Visit https://developers.google.com/calendar/api/quickstart/python to set up.")
-  
-  creds = None
-  if os.path.exists(TOKEN_PATH):
-    with open(TOKEN_PATH) as token_file:
-      creds = Credentials.from_authorized_user_info(json.load(token_file))
+def parse_event(response_text):
+  """Parse the LLM's JSON answer, raising ValueError if it isn't a usable event (or no_event)."""
+  # Find JSON in response if wrapped in backticks
+  json_match = re.search(r'```json\s*(.*?)\s*```', response_text, re.DOTALL)
+  if json_match:
+    response_text = json_match.group(1)
   
-  # If no credentials or they're invalid, refresh or run the flow
-  if not creds or not creds.valid:
-    if creds and creds.expired and creds.refresh_token:
-      print("Refreshing expired Google credentials...")
-      creds.refresh(Request())
-    else:
-      print("Authorizing Google Calendar access...")
-      flow = InstalledAppFlow.from_client_secrets_file(CREDENTIALS_PATH, SCOPES)
-      creds = flow.run_local_server(port=0)
-    
-    # Save the refreshed/new credentials
-    with open(TOKEN_PATH, 'w') as token:
-      token.write(creds.to_json())
+  event_data = json.loads(response_text.replace(': null', ': ""'))
+  if not isinstance(event_data, dict):
+    raise ValueError("Could not read the event details from the LLM's response")
+  if event_data.get('no_event'):
+    return event_data
   
-  return creds
+  # Times must be ISO datetimes (end_time may be empty)
+  for field in ('start_time', 'end_time'):
+    value = event_data.get(field, '')
+    if value or field == 'start_time':
+      try:
+        datetime.datetime.fromisoformat(value)
+      except (TypeError, ValueError):
+        raise ValueError(f"The LLM returned an invalid {field}: {value!r}")
+  return event_data
 
-def create_calendar_event(event_data):
-  """Create a Google Calendar event with the extracted data."""
+def create_calendar_event(event_data, service):
+  """Create a Google Calendar event with the extracted data using the Calendar client."""
   # Format the event data for Google Calendar
   now = datetime.datetime.now()
   
@@ -202,10 +186,6 @@ def create_calendar_event(event_data):
     },
   }
   
-  # Get credentials and create the event
-  creds = get_google_credentials()
-  service = build('calendar', 'v3', credentials=creds)
-  
   # Create the event in the primary calendar
   created_event = service.events().insert(calendarId='primary', body=event).execute()
   return created_event.get('htmlLink'), created_event.get('id')
@@ -229,6 +209,11 @@ def get_notion_calendar_url(event_id: str) -> str:
 # ------------------ Main Function ------------------
 def main():
   try:
+    # Load credentials and build the Calendar client while the LLM extracts the
+    # event; auth errors surface below when the client is collected, and the
+    # browser authorization prompt (if needed) only opens once there's an event
+    service = prefetch_service()
+
     clipboard_content = get_clipboard_content()
     if not clipboard_content:
       raise ValueError("Clipboard is empty")
@@ -243,7 +228,7 @@ def main():
       print(f"Where: {event_data.get('location')}")
     
     print("\nCreating calendar event...")
-    google_calendar_url, event_id = create_calendar_event(event_data)
+    google_calendar_url, event_id = create_calendar_event(event_data, service.result() or get_service())
     
     # Convert to Notion Calendar URL
     print(f"Event ID: {event_id}")
@@ -12,28 +12,21 @@
 # @raycast.description Polish highlighted email text using Claude Opus 4.6
 # @raycast.author Jesse Gilbert
 
+# Hand off to the resident script daemon if it's running (see utils/daemon.py)
+from utils.daemon import forward
+forward(__file__)
+
 import sys
-import subprocess
-import time
-from utils import ask, copy_to_clipboard, paste_text
+from utils import ask, copy_to_clipboard, paste_text, copy_selection
+from utils.clipboard import get_backend, SELECTION_TIMEOUT
 
 def main():
-  active_app = subprocess.run([
-    'osascript', '-e',
-    'tell application "System Events" to get name of first application process whose frontmost is true'
-  ], capture_output=True, text=True).stdout.strip()
-
-  initial_clipboard = subprocess.run(['pbpaste'], capture_output=True, text=True).stdout
-
-  subprocess.run([
-    'osascript', '-e',
-    f'tell application "System Events" to tell application process "{active_app}" to keystroke "c" using command down'
-  ])
-  time.sleep(0.05)
+  initial_clipboard = get_backend().read_text()
 
-  selected_text = subprocess.run(['pbpaste'], capture_output=True, text=True).stdout
+  # Looks up the frontmost app and copies in one AppleScript round trip
+  active_app, selected_text = copy_selection(timeout=SELECTION_TIMEOUT)
 
-  if not selected_text or selected_text == initial_clipboard:
+  if not selected_text:
     print("Error: No text selected")
     sys.exit(1)
 
@@ -12,66 +12,165 @@
 # @raycast.description Fix spelling and grammar of highlighted text using AI
 # @raycast.author Jesse Gilbert
 
+# Hand off to the resident script daemon if it's running (see utils/daemon.py)
+from utils.daemon import forward
+forward(__file__)
+
+import argparse
+import json
+import os
 import sys
-from spellchecker import SpellChecker
+import time
 from utils import get_selected_text_or_all, ask, copy_to_clipboard, paste_text
+from utils.env import REPO_DIR
+
+LLM_MODEL = "meta-llama/llama-3-8b-instruct"
+
+# Long selections are corrected in chunks of at most this many characters,
+# split between paragraphs or sentences, with up to MAX_WORKERS LLM calls at once
+CHUNK_CHARS = 600
+MAX_WORKERS = 4
 
-spell = SpellChecker()
+# One JSON line per fix: which path produced it and how long the correction took
+STATS_PATH = os.getenv("FIX_SPELLING_STATS_PATH", os.path.join(REPO_DIR, "fix-spelling-stats.jsonl"))
+
+PROMPT = """Fix any spelling and grammar errors in the following text.
+Some notes:
+- Do NOT add a period to the end of the text
+- IMPORTANT: Maintain the original capitalization of the input text (do NOT uppercase the first letter of the text if it wasn't already uppercase)
+
+Return only the corrected text without any explanation or formatting.
+  
+<text>
+{text}
+</text>
+"""
 
 def fix_single_word(word):
+  """The word with a clear-cut typo fixed, or None to leave it to the general path."""
   stripped = word.strip()
   if not stripped:
     return None
-  was_upper = stripped[0].isupper()
-  lower = stripped.lower()
-  if lower in spell:
-    return None
-  correction = spell.correction(lower)
-  if not correction or correction == lower:
-    return None
-  if was_upper:
-    correction = correction[0].upper() + correction[1:]
-  return correction
+  # Memory-mapped on first use, so multi-word selections never load it
+  from utils.spelling import fix_word
+  # A lone word has no context for the LLM to use, so take the most common
+  # fix rather than insisting on a clear winner
+  return fix_word(stripped, min_ratio=1)
 
 def is_single_word(text):
   return len(text.split()) == 1
 
+def _split_whitespace(text):
+  """(leading whitespace, content, trailing whitespace)"""
+  content = text.strip()
+  if not content:
+    return text, '', ''
+  start = text.index(content)
+  return text[:start], content, text[start + len(content):]
+
+def fix_with_llm(text):
+  """Correct text with the LLM, keeping its surrounding whitespace (ask() strips it)."""
+  leading, content, trailing = _split_whitespace(text)
+  corrected = ask(PROMPT.format(text=content), model=LLM_MODEL, cache=True)
+  return leading + corrected + trailing if corrected else None
+
+def correct(text):
+  """Return (corrected text or None, which path produced it).
+
+  Text is split into paragraph- or sentence-sized chunks. Chunks whose only
+  problems are clear-cut typos are fixed locally and never reach the LLM; the
+  rest (including ones with no typo found, which may still have grammar or
+  wrong-word mistakes) are sent to it concurrently and everything is
+  joined back in order with the original separators.
+  """
+  if is_single_word(text):
+    corrected = fix_single_word(text)
+    if corrected:
+      return corrected, 'single word'
+
+  from concurrent.futures import ThreadPoolExecutor
+  from utils.spelling import fix_text
+  from utils.text import chunk_text
+
+  chunks = chunk_text(text, CHUNK_CHARS)
+  fixed = []
+  unsure = []
+  for index, chunk in enumerate(chunks):
+    local = fix_text(chunk)
+    fixed.append(local.text)
+    if not local.confident:
+      where = f" (part {index + 1} of {len(chunks)})" if len(chunks) > 1 else ""
+      print(f"Asking the LLM{where}: {local.reason}")
+      unsure.append(index)
+  if not unsure:
+    return ''.join(fixed), 'local'
+
+  with ThreadPoolExecutor(max_workers=MAX_WORKERS) as pool:
+    for index, corrected in zip(unsure, pool.map(fix_with_llm, [chunks[i] for i in unsure])):
+      if not corrected:
+        return None, 'llm'
+      fixed[index] = corrected
+  return ''.join(fixed), 'llm'
+
+# ------------------- Stats -------------------
+
+def record_run(path, seconds, chars):
+  try:
+    with open(STATS_PATH, 'a', encoding='utf-8') as f:
+      f.write(json.dumps({'at': time.time(), 'path': path, 'seconds': round(seconds, 4), 'chars': chars}) + '\n')
+  except OSError as e:
+    print(f"Could not record stats: {e}")
+
+def print_stats():
+  """How often the LLM was skipped, and roughly how much waiting that saved."""
+  import statistics
+  try:
+    with open(STATS_PATH, encoding='utf-8') as f:
+      runs = [json.loads(line) for line in f if line.strip()]
+  except FileNotFoundError:
+    runs = []
+  if not runs:
+    print("No fixes recorded yet")
+    return
+
+  by_path = {}
+  for run in runs:
+    by_path.setdefault(run['path'], []).append(run['seconds'])
+  llm_runs = by_path.get('llm', [])
+  avoided = len(runs) - len(llm_runs)
+  print(f"{len(runs)} fixes, {avoided} without the LLM ({avoided / len(runs):.0%})")
+  for path, seconds in sorted(by_path.items()):
+    print(f"  {path:<12} {len(seconds):5}  median {statistics.median(seconds) * 1000:8.1f} ms")
+  if llm_runs and avoided:
+    # What each avoided call would have cost at the median LLM latency
+    llm_median = statistics.median(llm_runs)
+    saved = sum(max(llm_median - s, 0) for path, seconds in by_path.items() if path != 'llm' for s in seconds)
+    print(f"Time saved: ~{saved:.1f}s ({saved / avoided:.2f}s per fix, median LLM fix {llm_median:.2f}s)")
+
 def main():
+  parser = argparse.ArgumentParser(description="Fix spelling and grammar of the selected text")
+  parser.add_argument('--stats', action='store_true', help='Show how often the LLM was avoided and the time saved')
+  args = parser.parse_args()
+  if args.stats:
+    print_stats()
+    return
+
   selected_text, initial_clipboard, active_app = get_selected_text_or_all()
 
   if not selected_text:
     print("Error: No text to fix")
     sys.exit(1)
   
-  if len(selected_text) > 600:
-    print("Error: Text is too long (600 character limit)")
-    copy_to_clipboard(initial_clipboard)
-    sys.exit(1)
-
-  corrected_text = None
-
-  if is_single_word(selected_text):
-    corrected_text = fix_single_word(selected_text)
-
-  if not corrected_text:
-    prompt = f"""Fix any spelling and grammar errors in the following text.
-Some notes:
-- Do NOT add a period to the end of the text
-- IMPORTANT: Maintain the original capitalization of the input text (do NOT uppercase the first letter of the text if it wasn't already uppercase)
-
-Return only the corrected text without any explanation or formatting.
-  
-<text>
-{selected_text}
-</text>
-"""
-    corrected_text = ask(prompt, model="meta-llama/llama-3-8b-instruct")
-  print(f"corrected_text: {corrected_text}")
+  start = time.perf_counter()
+  corrected_text, path = correct(selected_text)
+  seconds = time.perf_counter() - start
+  print(f"corrected_text ({path}, {seconds * 1000:.0f} ms): {corrected_text}")
   
   if not corrected_text:
     # Restore original clipboard if error
     copy_to_clipboard(initial_clipboard)
     sys.exit(1)
+  record_run(path, seconds, len(selected_text))
   
   # Copy corrected text to clipboard
   if not copy_to_clipboard(corrected_text):
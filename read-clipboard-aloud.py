@@ -13,6 +13,10 @@
 # @raycast.description Read the last clipboard item aloud using OpenAI TTS
 # @raycast.author Jesse Gilbert
 
+# Hand off to the resident script daemon if it's running (see utils/daemon.py)
+from utils.daemon import forward
+forward(__file__)
+
 import sys
 from utils import get_clipboard_content, text_to_speech
 
@@ -31,11 +35,6 @@ def main():
     
     print(f"🔊 Reading clipboard content...")
     
-    # Truncate very long text for better TTS experience
-    if len(text) > 1000:
-      text = text[:1000] + "... (truncated)"
-      print("ℹ️  Long text truncated to 1000 characters")
-    
     success = text_to_speech(text)
     
     if success:
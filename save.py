@@ -14,6 +14,10 @@
 # @raycast.description Save clipboard content to a file in Documents/buffer directory
 # @raycast.author Jesse Gilbert
 
+# Hand off to the resident script daemon if it's running (see utils/daemon.py)
+from utils.daemon import forward
+forward(__file__)
+
 import sys
 import os
 from datetime import datetime
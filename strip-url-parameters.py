@@ -12,10 +12,10 @@
 # @raycast.description Strip query parameters from the current URL and navigate to the clean URL
 # @raycast.author Jesse Gilbert
 
-import subprocess
 import sys
 import re
 from urllib.parse import urlparse, urlunparse, parse_qs, urlencode
+from utils import applescript
 
 def get_current_url():
   """Get current URL from Arc browser or fallback to other browsers."""
@@ -25,16 +25,28 @@ def get_current_url():
     ('Google Chrome', 'tell application "Google Chrome" to get URL of active tab of front window'),
     ('Firefox', 'tell application "Firefox" to get URL of active tab of front window')
   ]
-  
-  for browser_name, script in browsers:
-    try:
-      result = subprocess.run(['osascript', '-e', script], 
-                             capture_output=True, text=True, timeout=5)
-      if result.returncode == 0 and result.stdout.strip():
-        return result.stdout.strip(), browser_name
-    except:
-      continue
-  
+
+  # Ask every running browser in one round trip (checking it's running so we
+  # don't launch it); optional() keeps a browser that isn't installed or has
+  # no window from failing the others
+  fragments = [
+    applescript.optional(applescript.Fragment(
+      f'if application "{browser_name}" is running then\n'
+      f'with timeout of 5 seconds\n{script}\nend timeout\nreturn result\n'
+      f'end if\nreturn ""',
+      True
+    ))
+    for browser_name, script in browsers
+  ]
+  try:
+    urls = applescript.run(*fragments)
+  except applescript.AppleScriptError:
+    return None, None
+
+  for (browser_name, _), url in zip(browsers, urls):
+    if url.strip():
+      return url.strip(), browser_name
+
   return None, None
 
 def strip_url_parameters(url):
@@ -71,12 +83,11 @@ def navigate_current_tab(url, browser_name):
   script = scripts.get(browser_name)
   if not script:
     return False
-    
+
   try:
-    result = subprocess.run(['osascript', '-e', script], 
-                           capture_output=True, text=True, timeout=5)
-    return result.returncode == 0
-  except:
+    applescript.get_host().execute(script)
+    return True
+  except applescript.AppleScriptError:
     return False
 
 def main():
@@ -12,28 +12,106 @@
 # @raycast.description Summarize clipboard content using Haiku 4.5
 # @raycast.author Jesse Gilbert
 
+# Hand off to the resident script daemon if it's running (see utils/daemon.py)
+from utils.daemon import forward
+forward(__file__)
+
 import sys
-from utils import get_clipboard_text, ask
+import time
+from concurrent.futures import ThreadPoolExecutor
+from utils import get_clipboard_text, ask, ask_stream
+from utils.text import CHARS_PER_TOKEN, chunk_text, estimate_tokens
+
+# Texts estimated above this many tokens are summarized in chunks (map) whose
+# summaries are then combined (reduce)
+CHUNKED_THRESHOLD_TOKENS = 8000
+CHUNK_TOKENS = 3000
+MAX_WORKERS = 4
+
+SUMMARY_PROMPT = """Summarize the following text concisely. Use bullet points for key points if appropriate.
+
+<text>
+{text}
+</text>"""
+
+CHUNK_PROMPT = """The following is part {index} of {count} of a longer text. Summarize this part concisely, keeping the key points, names, numbers and decisions. Return only the summary.
+
+<text>
+{text}
+</text>"""
+
+COMBINE_PROMPT = """The following are summaries of consecutive parts of one longer text. Combine them into a single concise summary of the whole text. Use bullet points for key points if appropriate.
+
+<summaries>
+{text}
+</summaries>"""
+
+def print_stream(prompt):
+  """Print a completion as it streams in. Returns the finished stream, or None on failure."""
+  stream = ask_stream(prompt)
+  started = False
+  try:
+    for delta in stream:
+      # Skip leading whitespace, as ask() strips it
+      if not started:
+        delta = delta.lstrip()
+        started = bool(delta)
+      print(delta, end='', flush=True)
+  except Exception as e:
+    print(f"\n❌ Failed to generate summary: {e}")
+    return None
+
+  if not stream.text.strip():
+    print("❌ Failed to generate summary")
+    return None
+  print()
+  return stream
+
+def summarize_chunks(text):
+  """Summarize each chunk of text concurrently. Returns the summaries in order, or None."""
+  chunks = chunk_text(text, CHUNK_TOKENS * CHARS_PER_TOKEN)
+  prompts = [CHUNK_PROMPT.format(index=i + 1, count=len(chunks), text=chunk) for i, chunk in enumerate(chunks)]
+  with ThreadPoolExecutor(max_workers=MAX_WORKERS) as pool:
+    summaries = list(pool.map(ask, prompts))
+  return None if not all(summaries) else summaries
+
+def summarize_chunked(text):
+  """Map-reduce summary for text too long for one prompt, with per-stage timings."""
+  start = time.perf_counter()
+  timings = []
+  # Keep condensing until the partial summaries fit in one combine prompt
+  while estimate_tokens(text) > CHUNK_TOKENS:
+    stage_start = time.perf_counter()
+    summaries = summarize_chunks(text)
+    if not summaries:
+      print("❌ Failed to summarize part of the text")
+      return False
+    timings.append(f"map {len(summaries)} parts {time.perf_counter() - stage_start:.1f}s")
+    condensed = '\n\n'.join(summaries)
+    if len(condensed) >= len(text):
+      break  # Not getting any shorter; combine what we have
+    text = condensed
+
+  stream = print_stream(COMBINE_PROMPT.format(text=text))
+  if not stream:
+    return False
+  timings.append(f"reduce {stream.total_time:.1f}s (first token {stream.time_to_first_token:.1f}s)")
+  print(f"\n⏱ {' · '.join(timings)} · total {time.perf_counter() - start:.1f}s")
+  return True
 
 def main():
   text = get_clipboard_text()
   if not text:
     print("❌ Clipboard is empty")
     sys.exit(1)
-  
-  prompt = f"""Summarize the following text concisely. Use bullet points for key points if appropriate.
 
-<text>
-{text}
-</text>"""
-  
-  summary = ask(prompt)
-  if not summary:
-    print("❌ Failed to generate summary")
+  if estimate_tokens(text) > CHUNKED_THRESHOLD_TOKENS:
+    success = summarize_chunked(text)
+  else:
+    # Print the summary as it streams in rather than after it's all generated
+    success = print_stream(SUMMARY_PROMPT.format(text=text)) is not None
+  if not success:
     sys.exit(1)
-  
-  print(summary)
 
 if __name__ == "__main__":
   main()
-
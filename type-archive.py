@@ -12,52 +12,38 @@
 # @raycast.description Navigates to end Notion pages and creates an archive toggle block
 # @raycast.author Jesse Gilbert
 
-from pynput.keyboard import Controller, Key
-import time
+from utils.keystrokes import Keystroke, play
+
+ARCHIVE_TEXT = "---> Archive"
+
+def archive_schedule():
+  """Keystrokes that jump to the end of the page and start an archive toggle."""
+  schedule = []
+  at = 0.1
+
+  def add(action, key, pause):
+    nonlocal at
+    schedule.append(Keystroke(action, key, at))
+    at += pause
 
-def main():
-  keyboard = Controller()
-  text = "---> Archive"
-  
-  time.sleep(0.1)
-  
   # Navigate to bottom of document
-  keyboard.press(Key.esc)
-  keyboard.release(Key.esc)
-  time.sleep(0.05)
-  
-  with keyboard.pressed(Key.cmd):
-    keyboard.press(Key.down)
-    keyboard.release(Key.down)
-  time.sleep(0.05)
-  
-  keyboard.type('\n')
-  time.sleep(0.05)
-  keyboard.type('\n')
-  time.sleep(0.05)
-  keyboard.type('\n')
-  time.sleep(0.05)
-  keyboard.type('\n')
-  
+  add('key', 'esc', 0.05)
+  add('key', 'cmd+down', 0.05)
+  for _ in range(4):
+    add('key', 'enter', 0.05)
+
+  # Outdent back to the top level
   for _ in range(4):
-    with keyboard.pressed(Key.shift):
-      keyboard.press(Key.tab)
-      keyboard.release(Key.tab)
-    time.sleep(0.02)
-  
-  for char in text:
-    if char == '\n':
-      keyboard.press(Key.enter)
-      keyboard.release(Key.enter)
-    else:
-      keyboard.type(char)
-    time.sleep(0.02)
-  
-  keyboard.press(Key.enter)
-  keyboard.release(Key.enter)
-  
+    add('key', 'shift+tab', 0.02)
+
+  for char in ARCHIVE_TEXT:
+    add('type', char, 0.02)
+  add('key', 'enter', 0)
+  return schedule
+
+def main():
+  play(archive_schedule())
   print("📦 Typed archive block")
 
 if __name__ == "__main__":
   main()
-
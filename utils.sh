@@ -77,20 +77,50 @@ open_content() {
   fi
 }
 
-# Copy selected text from the active application
-copy_selected_text() {
-  local active_app=$(osascript -e 'tell application "System Events" to get name of first application process whose frontmost is true')
-  
-  osascript <<EOF
+# Send keystrokes ($2, AppleScript lines) to app $1, then wait for the clipboard
+# to change instead of sleeping a fixed time. Polls NSPasteboard's change count
+# inside the same osascript call for up to ${3:-250} ms, then sends any
+# follow-up keystrokes ($4). Returns 1 if the clipboard never changed.
+keystrokes_and_wait_for_clipboard() {
+  local active_app="$1"
+  local keystrokes="$2"
+  local timeout_ms="${3:-250}"
+  local after="$4"
+
+  local result=$(osascript <<EOF
+use framework "AppKit"
+use scripting additions
+set pasteboard to current application's NSPasteboard's generalPasteboard()
+set changeCountBefore to pasteboard's changeCount()
 tell application "System Events"
   tell application process "$active_app"
-    keystroke "c" using command down
+    $keystrokes
   end tell
 end tell
+set changed to false
+repeat $((timeout_ms / 5)) times
+  if (pasteboard's changeCount()) is not changeCountBefore then
+    set changed to true
+    exit repeat
+  end if
+  delay 0.005
+end repeat
+tell application "System Events"
+  tell application process "$active_app"
+    $after
+  end tell
+end tell
+return changed
 EOF
-  
-  # Small delay to ensure clipboard is updated
-  sleep 0.05
+)
+  [ "$result" = "true" ]
+}
+
+# Copy selected text from the active application
+copy_selected_text() {
+  local active_app=$(osascript -e 'tell application "System Events" to get name of first application process whose frontmost is true')
+
+  keystrokes_and_wait_for_clipboard "$active_app" 'keystroke "c" using command down'
 }
 
 # Get text from selection first, then clipboard, including image processing
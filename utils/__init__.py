@@ -0,0 +1,41 @@
+"""Shared helpers for the Raycast scripts.
+
+The helpers are split into submodules (clipboard, notion, dates, llm, tts) that
+are only imported the first time one of their names is looked up, and the
+heavy third-party packages (openai, requests, dotenv) are imported inside the
+functions that need them. A hotkey script that only does
+`from utils import copy_to_clipboard` never pays for the LLM stack.
+"""
+
+import importlib
+
+# Public name -> submodule that defines it
+_EXPORTS = {
+  'get_clipboard_text': 'clipboard',
+  'copy_to_clipboard': 'clipboard',
+  'get_clipboard_content': 'clipboard',
+  'wait_for_clipboard_change': 'clipboard',
+  'get_frontmost_app': 'clipboard',
+  'copy_selection': 'clipboard',
+  'get_selected_text_or_all': 'clipboard',
+  'paste_text': 'clipboard',
+  'add_task_to_notion': 'notion',
+  'add_tasks_to_notion': 'notion',
+  'parse_task_line': 'notion',
+  'parse_date': 'dates',
+  'parse_dates': 'dates',
+  'ask': 'llm',
+  'ask_stream': 'llm',
+  'text_to_speech': 'tts',
+}
+
+def __getattr__(name):
+  module_name = _EXPORTS.get(name)
+  if module_name is None:
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+  value = getattr(importlib.import_module(f"{__name__}.{module_name}"), name)
+  globals()[name] = value
+  return value
+
+def __dir__():
+  return sorted(set(globals()) | set(_EXPORTS))
@@ -0,0 +1,269 @@
+"""Run AppleScript without paying an osascript spawn per action.
+
+Every `osascript -e` call compiles its script from scratch in a new process,
+which costs tens of milliseconds. The executor here keeps one scripting host
+alive for the whole process and can send several fragments in a single round
+trip:
+
+  app, _ = run(FRONTMOST_APP, keystroke('c'))
+
+Hosts:
+  inprocess - NSAppleScript through pyobjc, compiled scripts cached (no spawns)
+  osascript - one long-lived `osascript -l JavaScript` child fed over stdin
+  recording - records scripts and round trips for tests on Linux
+
+Pick one with RAYCAST_APPLESCRIPT, otherwise inprocess when pyobjc is installed.
+"""
+
+import os
+import subprocess
+from collections import namedtuple
+
+# A piece of AppleScript. If `returns` is set, its result is handed back,
+# otherwise the fragment is an action and yields ''.
+Fragment = namedtuple('Fragment', ['source', 'returns'])
+
+# Separates the per-fragment results in a batch's text result (ASCII record separator)
+_SEPARATOR = '\x1e'
+
+class AppleScriptError(Exception):
+  pass
+
+def quote(text):
+  """Quote text as an AppleScript string literal."""
+  return '"' + text.replace('\\', '\\\\').replace('"', '\\"') + '"'
+
+# ------------------- Fragments -------------------
+
+FRONTMOST_APP = Fragment(
+  'tell application "System Events" to get name of first application process whose frontmost is true',
+  True
+)
+
+def _target(app):
+  if app:
+    return f'application process {quote(app)}'
+  return '(first application process whose frontmost is true)'
+
+def keystroke(key, modifiers=('command',), app=None):
+  """Fragment that types `key` (with modifiers) into app, or the frontmost app."""
+  using = ''
+  if modifiers:
+    using = ' using {' + ', '.join(f'{m} down' for m in modifiers) + '}'
+  return Fragment(f'tell application "System Events" to tell {_target(app)} to keystroke {quote(key)}{using}', False)
+
+def key_code(code, modifiers=(), app=None):
+  """Fragment that presses a key by virtual key code (e.g. 36 = return)."""
+  using = ''
+  if modifiers:
+    using = ' using {' + ', '.join(f'{m} down' for m in modifiers) + '}'
+  return Fragment(f'tell application "System Events" to tell {_target(app)} to key code {code}{using}', False)
+
+def delay(seconds):
+  """Fragment that pauses the batch, e.g. to let an app act on one keystroke before the next."""
+  return Fragment(f'delay {seconds}', False)
+
+def optional(fragment):
+  """Compile and run the fragment only at run time, yielding '' if it fails.
+
+  Use this for scripts that reference apps which may not be installed, since
+  those would otherwise fail to compile and take the whole batch with them.
+  """
+  return Fragment(f'run script {quote(fragment.source)}', fragment.returns)
+
+def compile_batch(fragments):
+  """Combine fragments into one script that returns their results joined by _SEPARATOR."""
+  lines = ['set _results to {}']
+  for fragment in fragments:
+    lines += ['try', fragment.source]
+    if fragment.returns:
+      lines.append('set end of _results to (result as text)')
+    else:
+      lines.append('set end of _results to ""')
+    lines += ['on error', 'set end of _results to ""', 'end try']
+  lines += [
+    f'set AppleScript\'s text item delimiters to (character id {ord(_SEPARATOR)})',
+    'return _results as text',
+  ]
+  return '\n'.join(lines)
+
+# ------------------- Hosts -------------------
+
+class ScriptHost:
+  """Something that can execute AppleScript source and return its result as text."""
+
+  def execute(self, source):
+    raise NotImplementedError
+
+  def run(self, fragments):
+    results = self.execute(compile_batch(fragments)).split(_SEPARATOR)
+    # AppleScript renders an empty list as '', so pad to one result per fragment
+    return (results + [''] * len(fragments))[:len(fragments)]
+
+class InProcessHost(ScriptHost):
+  """Runs scripts through NSAppleScript in this process, caching compiled scripts."""
+
+  def __init__(self):
+    from Foundation import NSAppleScript
+    self.NSAppleScript = NSAppleScript
+    self.compiled = {}
+
+  def execute(self, source):
+    script = self.compiled.get(source)
+    if script is None:
+      script = self.NSAppleScript.alloc().initWithSource_(source)
+      ok, error = script.compileAndReturnError_(None)
+      if not ok:
+        raise AppleScriptError(error.get('NSAppleScriptErrorMessage', 'compile failed'))
+      self.compiled[source] = script
+    descriptor, error = script.executeAndReturnError_(None)
+    if descriptor is None:
+      raise AppleScriptError(error.get('NSAppleScriptErrorMessage', 'execution failed'))
+    return descriptor.stringValue() or ''
+
+# JXA loop run by the long-lived osascript child. Reads NUL-terminated
+# AppleScript sources from stdin and answers each with a NUL-terminated
+# "O<result>" or "E<error message>", caching one NSAppleScript per source.
+_HOST_JXA = r'''
+ObjC.import('Foundation');
+const stdin = $.NSFileHandle.fileHandleWithStandardInput;
+const stdout = $.NSFileHandle.fileHandleWithStandardOutput;
+const compiled = {};
+let pending = $.NSMutableData.data;
+let buffer = '';
+function reply(text) {
+  stdout.writeData($(text.replace(/\0/g, '') + '\0').dataUsingEncoding($.NSUTF8StringEncoding));
+}
+while (true) {
+  const data = stdin.availableData;
+  if (data.length == 0) break;
+  pending.appendData(data);
+  const text = $.NSString.alloc.initWithDataEncoding(pending, $.NSUTF8StringEncoding);
+  if (text.isNil()) continue;  // chunk ended mid-character, wait for the rest
+  buffer += text.js;
+  pending = $.NSMutableData.data;
+  let end;
+  while ((end = buffer.indexOf('\0')) >= 0) {
+    const source = buffer.slice(0, end);
+    buffer = buffer.slice(end + 1);
+    let script = compiled[source];
+    if (!script) {
+      script = $.NSAppleScript.alloc.initWithSource($(source));
+      compiled[source] = script;
+    }
+    const error = Ref();
+    const result = script.executeAndReturnError(error);
+    if (result.isNil()) {
+      reply('E' + ObjC.unwrap(error[0].objectForKey('NSAppleScriptErrorMessage')));
+    } else {
+      reply('O' + (ObjC.unwrap(result.stringValue) || ''));
+    }
+  }
+}
+'''
+
+class OsascriptHost(ScriptHost):
+  """Keeps one osascript process alive and sends it scripts over stdin."""
+
+  def __init__(self):
+    self.process = None
+
+  def _start(self):
+    self.process = subprocess.Popen(
+      ['osascript', '-l', 'JavaScript', '-e', _HOST_JXA],
+      stdin=subprocess.PIPE, stdout=subprocess.PIPE, stderr=subprocess.DEVNULL
+    )
+
+  def _read_reply(self):
+    data = bytearray()
+    while True:
+      byte = self.process.stdout.read(1)
+      if not byte:
+        raise AppleScriptError("osascript host exited")
+      if byte == b'\0':
+        return data.decode('utf-8', errors='replace')
+      data += byte
+
+  def execute(self, source):
+    if self.process is None or self.process.poll() is not None:
+      self._start()
+    try:
+      self.process.stdin.write(source.replace('\0', '').encode('utf-8') + b'\0')
+      self.process.stdin.flush()
+      reply = self._read_reply()
+    except (OSError, AppleScriptError):
+      self.process = None
+      raise
+    if reply.startswith('E'):
+      raise AppleScriptError(reply[1:])
+    return reply[1:]
+
+  def close(self):
+    if self.process and self.process.poll() is None:
+      self.process.stdin.close()
+      self.process.wait(timeout=1)
+    self.process = None
+
+class RecordingHost(ScriptHost):
+  """Fake host that records what it's sent instead of running anything.
+
+  `responses` maps a returning fragment's source to the text it should
+  produce; anything else yields ''. `spawns` counts the host processes a real
+  host would have started (one, on first use), `scripts` holds each compiled
+  round trip and `fragments` every fragment in the order it was sent.
+  """
+
+  def __init__(self, responses=None):
+    self.responses = responses or {}
+    self.scripts = []
+    self.fragments = []
+    self.spawns = 0
+
+  @property
+  def round_trips(self):
+    return len(self.scripts)
+
+  def execute(self, source):
+    if not self.scripts:
+      self.spawns += 1
+    self.scripts.append(source)
+    return ''
+
+  def run(self, fragments):
+    self.execute(compile_batch(fragments))
+    self.fragments.extend(fragments)
+    return [self.responses.get(f.source, '') if f.returns else '' for f in fragments]
+
+HOSTS = {
+  'inprocess': InProcessHost,
+  'osascript': OsascriptHost,
+  'recording': RecordingHost,
+}
+
+# ------------------- Executor -------------------
+
+_host = None
+
+def get_host():
+  """Return the process-wide scripting host, starting it on first use."""
+  global _host
+  if _host is None:
+    name = os.getenv('RAYCAST_APPLESCRIPT')
+    if name:
+      _host = HOSTS[name]()
+    else:
+      try:
+        _host = InProcessHost()
+      except ImportError:
+        _host = OsascriptHost()
+  return _host
+
+def set_host(host):
+  """Swap the scripting host (e.g. a RecordingHost in tests). Returns the previous one."""
+  global _host
+  previous, _host = _host, host
+  return previous
+
+def run(*fragments):
+  """Run fragments in one round trip and return one result string per fragment."""
+  return get_host().run(fragments)
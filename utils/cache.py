@@ -0,0 +1,87 @@
+"""Small on-disk LRU cache (SQLite) shared by every script process.
+
+Values are bytes stored under a content hash of whatever produced them, so
+an identical request made again (re-running a hotkey on the same text) is
+answered locally. Entries expire after max_age seconds, and the least
+recently used ones are dropped once the file holds more than max_bytes.
+Every write is one SQLite transaction, so concurrent scripts never see a
+half-written entry.
+"""
+
+import hashlib
+import json
+import sqlite3
+import time
+from contextlib import closing
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS entries (
+  key TEXT PRIMARY KEY,
+  value BLOB NOT NULL,
+  size INTEGER NOT NULL,
+  created_at REAL NOT NULL,
+  accessed_at REAL NOT NULL
+)
+"""
+
+def cache_key(*parts):
+  """Hash JSON-serializable parts into a stable key."""
+  payload = json.dumps(parts, sort_keys=True, ensure_ascii=False, separators=(',', ':'))
+  return hashlib.sha256(payload.encode('utf-8')).hexdigest()
+
+class DiskCache:
+  """Size- and age-bounded LRU cache of bytes in a SQLite file."""
+
+  def __init__(self, path, max_bytes=50 * 1024 * 1024, max_age=30 * 24 * 3600):
+    self.path = path
+    self.max_bytes = max_bytes
+    self.max_age = max_age
+
+  def _connect(self):
+    conn = sqlite3.connect(self.path, timeout=10, isolation_level=None)
+    conn.execute("PRAGMA journal_mode=WAL")
+    conn.execute(_SCHEMA)
+    return conn
+
+  def get(self, key):
+    """Return the cached bytes for key, or None if missing or expired."""
+    now = time.time()
+    with closing(self._connect()) as conn:
+      row = conn.execute(
+        "SELECT value FROM entries WHERE key = ? AND created_at >= ?", (key, now - self.max_age)
+      ).fetchone()
+      if row is None:
+        return None
+      conn.execute("UPDATE entries SET accessed_at = ? WHERE key = ?", (now, key))
+    return bytes(row[0])
+
+  def put(self, key, value):
+    """Store value under key, then evict expired and least recently used entries."""
+    with closing(self._connect()) as conn:
+      conn.execute("BEGIN IMMEDIATE")
+      try:
+        now = time.time()
+        conn.execute(
+          "INSERT OR REPLACE INTO entries (key, value, size, created_at, accessed_at) VALUES (?, ?, ?, ?, ?)",
+          (key, value, len(value), now, now)
+        )
+        conn.execute("DELETE FROM entries WHERE created_at < ?", (now - self.max_age,))
+        # Keep the most recently used entries that fit in max_bytes
+        conn.execute(
+          "DELETE FROM entries WHERE key IN (SELECT key FROM ("
+          "SELECT key, SUM(size) OVER (ORDER BY accessed_at DESC, key) AS running FROM entries"
+          ") WHERE running > ?)",
+          (self.max_bytes,)
+        )
+        conn.execute("COMMIT")
+      except BaseException:
+        conn.execute("ROLLBACK")
+        raise
+
+  def delete(self, key):
+    with closing(self._connect()) as conn:
+      conn.execute("DELETE FROM entries WHERE key = ?", (key,))
+
+  def clear(self):
+    with closing(self._connect()) as conn:
+      conn.execute("DELETE FROM entries")
@@ -0,0 +1,300 @@
+import os
+import subprocess
+import sys
+import time
+
+# ------------------- Clipboard Backends -------------------
+# Each backend reads the clipboard straight from a child's stdout (or
+# in-process), so nothing goes through a temp file. Pick one explicitly with
+# RAYCAST_CLIPBOARD=mac|xclip|wayland|memory, otherwise it follows the platform.
+
+def _stdout_of(cmd, input=None):
+  """Run cmd and return its stdout bytes, or None if it failed or isn't installed."""
+  try:
+    result = subprocess.run(cmd, input=input, stdout=subprocess.PIPE, stderr=subprocess.DEVNULL)
+  except FileNotFoundError:
+    return None
+  return result.stdout if result.returncode == 0 else None
+
+class ClipboardBackend:
+  """Interface shared by the clipboard implementations."""
+
+  def read(self):
+    """Return {'type': 'image', 'content': png_bytes} or {'type': 'text', 'content': str}, or None if empty."""
+    raise NotImplementedError
+
+  def read_text(self):
+    """Return the clipboard text ('' if there isn't any)."""
+    raise NotImplementedError
+
+  def write_text(self, text):
+    raise NotImplementedError
+
+  def change_count(self):
+    """Return a value that changes whenever the clipboard does.
+
+    The default hashes the text, so a copy of identical text goes unnoticed;
+    backends with a real change counter override it.
+    """
+    return hash(self.read_text())
+
+class MacClipboard(ClipboardBackend):
+  """macOS pasteboard, in-process through AppKit when pyobjc is installed.
+
+  Without pyobjc it falls back to streaming `pngpaste -` and `pbpaste`.
+  """
+
+  def __init__(self):
+    try:
+      from AppKit import NSPasteboard
+      self.pasteboard = NSPasteboard.generalPasteboard()
+    except ImportError:
+      self.pasteboard = None
+
+  def _read_image(self):
+    if self.pasteboard is None:
+      return _stdout_of(['pngpaste', '-']) or None
+    from AppKit import NSBitmapImageFileTypePNG, NSBitmapImageRep, NSPasteboardTypePNG, NSPasteboardTypeTIFF
+    types = self.pasteboard.types() or []
+    if NSPasteboardTypePNG in types:
+      return bytes(self.pasteboard.dataForType_(NSPasteboardTypePNG))
+    if NSPasteboardTypeTIFF in types:
+      # Screenshots and most apps put TIFF on the pasteboard; convert like pngpaste does
+      rep = NSBitmapImageRep.imageRepWithData_(self.pasteboard.dataForType_(NSPasteboardTypeTIFF))
+      if rep is not None:
+        return bytes(rep.representationUsingType_properties_(NSBitmapImageFileTypePNG, {}))
+    return None
+
+  def read(self):
+    image = self._read_image()
+    if image:
+      return {'type': 'image', 'content': image}
+    text = self.read_text()
+    return {'type': 'text', 'content': text} if text else None
+
+  def read_text(self):
+    if self.pasteboard is None:
+      return (_stdout_of(['pbpaste']) or b'').decode('utf-8', errors='replace')
+    from AppKit import NSPasteboardTypeString
+    return self.pasteboard.stringForType_(NSPasteboardTypeString) or ''
+
+  def write_text(self, text):
+    subprocess.run(['pbcopy'], input=text.encode('utf-8'), check=True)
+
+  def change_count(self):
+    if self.pasteboard is None:
+      return super().change_count()
+    return self.pasteboard.changeCount()
+
+class XclipClipboard(ClipboardBackend):
+  """X11 clipboard through xclip."""
+
+  def _xclip_out(self, target):
+    return _stdout_of(['xclip', '-selection', 'clipboard', '-t', target, '-o'])
+
+  def read(self):
+    targets = (self._xclip_out('TARGETS') or b'').decode(errors='replace').split()
+    if 'image/png' in targets:
+      image = self._xclip_out('image/png')
+      if image:
+        return {'type': 'image', 'content': image}
+    text = self.read_text()
+    return {'type': 'text', 'content': text} if text else None
+
+  def read_text(self):
+    return (self._xclip_out('UTF8_STRING') or b'').decode('utf-8', errors='replace')
+
+  def write_text(self, text):
+    subprocess.run(['xclip', '-selection', 'clipboard', '-i'], input=text.encode('utf-8'), check=True)
+
+class WaylandClipboard(ClipboardBackend):
+  """Wayland clipboard through wl-clipboard (wl-paste / wl-copy)."""
+
+  def read(self):
+    types = (_stdout_of(['wl-paste', '--list-types']) or b'').decode(errors='replace').split()
+    if 'image/png' in types:
+      image = _stdout_of(['wl-paste', '--no-newline', '--type', 'image/png'])
+      if image:
+        return {'type': 'image', 'content': image}
+    text = self.read_text()
+    return {'type': 'text', 'content': text} if text else None
+
+  def read_text(self):
+    return (_stdout_of(['wl-paste', '--no-newline']) or b'').decode('utf-8', errors='replace')
+
+  def write_text(self, text):
+    subprocess.run(['wl-copy'], input=text.encode('utf-8'), check=True)
+
+class MemoryClipboard(ClipboardBackend):
+  """In-memory clipboard for tests and headless runs."""
+
+  def __init__(self, text='', image=None):
+    self.text = text
+    self.image = image
+    self.changes = 0
+
+  def read(self):
+    if self.image:
+      return {'type': 'image', 'content': self.image}
+    return {'type': 'text', 'content': self.text} if self.text else None
+
+  def read_text(self):
+    return self.text
+
+  def write_text(self, text):
+    self.text = text
+    self.image = None
+    self.changes += 1
+
+  def set_image(self, image):
+    self.image = image
+    self.changes += 1
+
+  def change_count(self):
+    return self.changes
+
+BACKENDS = {
+  'mac': MacClipboard,
+  'xclip': XclipClipboard,
+  'wayland': WaylandClipboard,
+  'memory': MemoryClipboard,
+}
+
+_backend = None
+
+def get_backend():
+  """Return the process-wide clipboard backend, creating it on first use."""
+  global _backend
+  if _backend is None:
+    name = os.getenv('RAYCAST_CLIPBOARD')
+    if not name:
+      if sys.platform == 'darwin':
+        name = 'mac'
+      elif os.getenv('WAYLAND_DISPLAY'):
+        name = 'wayland'
+      else:
+        name = 'xclip'
+    _backend = BACKENDS[name]()
+  return _backend
+
+def set_backend(backend):
+  """Swap the clipboard backend (e.g. a MemoryClipboard in tests). Returns the previous one."""
+  global _backend
+  previous, _backend = _backend, backend
+  return previous
+
+# ------------------- Clipboard Functions -------------------
+
+def get_clipboard_text(): # not used currently
+  """Get text content from clipboard."""
+  try:
+    text = get_backend().read_text().strip()
+    if not text:
+      print("Error: Clipboard is empty")
+      return None
+    return text
+  except Exception as e:
+    print(f"Error getting clipboard content: {str(e)}")
+    return None
+
+def copy_to_clipboard(text):
+  """Copy text to clipboard."""
+  try:
+    get_backend().write_text(text)
+    return True
+  except Exception as e:
+    print(f"Error copying to clipboard: {str(e)}")
+    return False
+
+def get_clipboard_content():
+  """Get content from clipboard, detect if it's text or image.
+
+  Returns:
+    dict: A dictionary with 'type' ('text' or 'image') and 'content' (text string or image bytes)
+  """
+  try:
+    content = get_backend().read()
+    if not content or (content['type'] == 'text' and not content['content'].strip()):
+      print("Error: Clipboard is empty")
+      return None
+    return content
+  except Exception as e:
+    print(f"Error getting clipboard content: {str(e)}")
+    return None
+
+# ------------------- Selection Functions -------------------
+
+# How long to wait for Cmd+C to land. With nothing selected most apps ignore
+# Cmd+C, so SELECTION_TIMEOUT is also how long "nothing selected" takes to detect.
+SELECTION_TIMEOUT = 0.25
+COPY_TIMEOUT = 1.0
+# Gap between Cmd+A and Cmd+C so slow apps have applied the selection before the copy
+SELECT_ALL_DELAY = 0.05
+
+def wait_for_clipboard_change(since, timeout=COPY_TIMEOUT, interval=0.005):
+  """Poll the clipboard's change count until it differs from `since`.
+
+  Returns True as soon as it changes, or False once `timeout` seconds pass.
+  """
+  backend = get_backend()
+  deadline = time.monotonic() + timeout
+  while backend.change_count() == since:
+    remaining = deadline - time.monotonic()
+    if remaining <= 0:
+      return False
+    time.sleep(min(interval, remaining))
+  return True
+
+def get_frontmost_app():
+  """Get the name of the frontmost application process."""
+  from utils import applescript
+  return applescript.run(applescript.FRONTMOST_APP)[0].strip()
+
+def copy_selection(active_app=None, select_all=False, timeout=COPY_TIMEOUT):
+  """Copy the selection in active_app (after Cmd+A if select_all).
+
+  When active_app isn't given, the frontmost app is looked up in the same
+  AppleScript round trip as the copy.
+
+  Returns:
+    tuple: (active_app, copied text), with the text None if the clipboard
+    didn't change within `timeout` seconds
+  """
+  from utils import applescript
+  backend = get_backend()
+  since = backend.change_count()
+  fragments = [applescript.keystroke('c', app=active_app)]
+  if select_all:
+    fragments[:0] = [applescript.keystroke('a', app=active_app), applescript.delay(SELECT_ALL_DELAY)]
+  if active_app is None:
+    fragments.insert(0, applescript.FRONTMOST_APP)
+    active_app = applescript.run(*fragments)[0].strip()
+  else:
+    applescript.run(*fragments)
+  if not wait_for_clipboard_change(since, timeout):
+    return active_app, None
+  return active_app, backend.read_text()
+
+def get_selected_text_or_all():
+  """Get selected text from active app, or select all if nothing selected."""
+  # Save initial clipboard
+  backend = get_backend()
+  initial_clipboard = backend.read_text()
+  since = backend.change_count()
+
+  # Copy selected text (looking up the frontmost app in the same round trip),
+  # and if nothing was selected, select all and copy again
+  active_app, selected_text = copy_selection(timeout=SELECTION_TIMEOUT)
+  print(f"active_app: {active_app}")
+  if not selected_text and backend.change_count() != since:
+    # The copy landed just after the timeout, so there was a selection after all
+    selected_text = backend.read_text()
+  if not selected_text:
+    _, selected_text = copy_selection(active_app, select_all=True)
+
+  return selected_text or '', initial_clipboard, active_app
+
+def paste_text(active_app):
+  """Paste text to the active application."""
+  from utils import applescript
+  applescript.run(applescript.keystroke('v', app=active_app))
@@ -0,0 +1,320 @@
+"""Optional resident daemon that keeps the Python scripts warm.
+
+Every Raycast hotkey normally starts a fresh interpreter, re-imports utils,
+re-reads .env, rebuilds API clients and (for fix-spelling) reloads the spell
+dictionary. The daemon does all of that once and then runs each script's
+main() in-process. Scripts opt in by calling forward() before their heavy
+imports:
+
+  from utils.daemon import forward
+  forward(__file__)
+
+forward() sends argv over a Unix socket, streams the script's output back and
+exits with its status. If the daemon isn't running it returns immediately and
+the script carries on in-process as before.
+
+Start it with `.venv/bin/python -m utils.daemon` (e.g. from a launchd agent),
+stop it with `.venv/bin/python -m utils.daemon stop`. Edited scripts are
+reloaded on their next run; edits to utils/ restart the daemon between runs.
+Requests are handled one at a time, since main() reads the global sys.argv,
+so while a long script runs (reading aloud, an OAuth prompt) other scripts
+give up on the daemon after ACCEPT_TIMEOUT and run in-process instead.
+Set RAYCAST_DAEMON=off to bypass it.
+"""
+
+import os
+import sys
+
+SOCKET_PATH = os.getenv("RAYCAST_DAEMON_SOCKET", f"/tmp/raycast-scripts-{os.getuid()}.sock")
+UTILS_DIR = os.path.dirname(os.path.abspath(__file__))
+REPO_DIR = os.path.dirname(UTILS_DIR)
+
+# Marker scripts use to opt in; the daemon preloads every script containing it
+OPT_IN_MARKER = "forward(__file__)"
+
+# Seconds forward() waits for the daemon to take its connection before running
+# the script in-process (the daemon is busy with another script)
+ACCEPT_TIMEOUT = 0.2
+
+# ------------------- Framing -------------------
+# Each frame is a 1-byte type, a 4-byte big-endian length, then the payload:
+#   a: accepted (empty, sent by the daemon as soon as it takes a connection),
+#   r: request (JSON), o: output (UTF-8), x: exit status (ASCII int)
+
+def _send(conn, kind, payload):
+  import struct
+  conn.sendall(struct.pack('>cI', kind, len(payload)) + payload)
+
+def _recv_exact(conn, size):
+  data = b''
+  while len(data) < size:
+    chunk = conn.recv(size - len(data))
+    if not chunk:
+      return None
+    data += chunk
+  return data
+
+def _recv(conn):
+  """Return (kind, payload), or (None, None) if the connection closed."""
+  import struct
+  header = _recv_exact(conn, 5)
+  if header is None:
+    return None, None
+  kind, size = struct.unpack('>cI', header)
+  payload = _recv_exact(conn, size)
+  if payload is None:
+    return None, None
+  return kind, payload
+
+# ------------------- Client -------------------
+
+def forward(script_file):
+  """Run the calling script in the daemon and exit with its status.
+
+  Returns without doing anything when the daemon isn't reachable or is busy
+  with another script (or when we're already inside it), so the caller just
+  continues in-process.
+  """
+  if os.getenv("RAYCAST_DAEMON", "").lower() == "off":
+    return
+  import json
+  import socket
+
+  conn = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+  try:
+    conn.connect(SOCKET_PATH)
+    # The request is only sent once the daemon has taken the connection, so
+    # one left in the backlog after we give up is never run
+    conn.settimeout(ACCEPT_TIMEOUT)
+    kind, _ = _recv(conn)
+    conn.settimeout(None)
+  except OSError:
+    kind = None
+  if kind != b'a':
+    conn.close()
+    return
+
+  request = {
+    'script': os.path.abspath(script_file),
+    'argv': sys.argv[1:],
+    'cwd': os.getcwd(),
+  }
+  received_output = False
+  try:
+    _send(conn, b'r', json.dumps(request).encode('utf-8'))
+    while True:
+      kind, payload = _recv(conn)
+      if kind == b'o':
+        received_output = True
+        sys.stdout.write(payload.decode('utf-8'))
+        sys.stdout.flush()
+      elif kind == b'x':
+        sys.exit(int(payload))
+      else:
+        break
+  except OSError:
+    pass
+  finally:
+    conn.close()
+
+  # The daemon went away mid-request. If it never started the script, run it
+  # here instead; otherwise re-running could repeat side effects like pasting.
+  if received_output:
+    print("Error: script daemon disconnected")
+    sys.exit(1)
+
+# ------------------- Server -------------------
+
+class _FrameWriter:
+  """Text stream that forwards everything written to it as output frames."""
+
+  encoding = 'utf-8'
+
+  def __init__(self, conn):
+    self.conn = conn
+
+  def write(self, text):
+    if text:
+      try:
+        _send(self.conn, b'o', text.encode('utf-8'))
+      except OSError:
+        pass  # Client went away; keep running so the script can clean up
+    return len(text)
+
+  def flush(self):
+    pass
+
+  def isatty(self):
+    return False
+
+class ScriptDaemon:
+  """Serves script runs over a Unix socket, caching each loaded script module."""
+
+  def __init__(self, socket_path=SOCKET_PATH):
+    self.socket_path = socket_path
+    self.scripts = {}  # path -> (mtime, module)
+    self.utils_mtimes = self._utils_mtimes()
+    self.server = None
+
+  def _utils_mtimes(self):
+    return {
+      name: os.stat(os.path.join(UTILS_DIR, name)).st_mtime
+      for name in os.listdir(UTILS_DIR) if name.endswith('.py')
+    }
+
+  def load(self, path):
+    """Return the module for a script, (re)importing it if the file changed."""
+    import importlib.util
+
+    mtime = os.stat(path).st_mtime
+    cached = self.scripts.get(path)
+    if cached and cached[0] == mtime:
+      return cached[1]
+
+    name = os.path.splitext(os.path.basename(path))[0].replace('-', '_')
+    spec = importlib.util.spec_from_file_location(f"raycast_script_{name}", path)
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+    if not callable(getattr(module, 'main', None)):
+      raise RuntimeError(f"{os.path.basename(path)} has no main()")
+    self.scripts[path] = (mtime, module)
+    return module
+
+  def preload(self):
+    """Import every opted-in script so their module-level setup is already done."""
+    for name in sorted(os.listdir(REPO_DIR)):
+      path = os.path.join(REPO_DIR, name)
+      if not name.endswith('.py'):
+        continue
+      with open(path, encoding='utf-8') as f:
+        if OPT_IN_MARKER not in f.read():
+          continue
+      try:
+        self.load(path)
+        print(f"Loaded {name}")
+      except BaseException as e:
+        print(f"Could not preload {name}: {e!r}")
+
+  def run(self, conn, request):
+    """Run one script's main() with its argv/cwd, streaming output to conn."""
+    import contextlib
+    import traceback
+
+    path = request['script']
+    writer = _FrameWriter(conn)
+    code = 0
+    saved_argv, saved_cwd = sys.argv, os.getcwd()
+    with contextlib.redirect_stdout(writer), contextlib.redirect_stderr(writer):
+      try:
+        sys.argv = [path] + list(request.get('argv', []))
+        os.chdir(request.get('cwd') or REPO_DIR)
+        self.load(path).main()
+      except SystemExit as e:
+        if isinstance(e.code, int) or e.code is None:
+          code = e.code or 0
+        else:
+          print(e.code)
+          code = 1
+      except Exception:
+        traceback.print_exc()
+        code = 1
+      finally:
+        sys.argv = saved_argv
+        os.chdir(saved_cwd)
+    return code
+
+  def handle(self, conn):
+    import json
+
+    try:
+      _send(conn, b'a', b'')
+    except OSError:
+      return  # Client gave up waiting while another script ran
+    kind, payload = _recv(conn)
+    if kind != b'r':
+      return
+    request = json.loads(payload)
+    if request.get('stop'):
+      _send(conn, b'x', b'0')
+      raise KeyboardInterrupt
+    code = self.run(conn, request)
+    try:
+      _send(conn, b'x', str(code).encode('ascii'))
+    except OSError:
+      pass
+
+  def bind(self):
+    import socket
+
+    # Refuse to start twice; clear out a stale socket left by a crash
+    if os.path.exists(self.socket_path):
+      probe = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+      try:
+        probe.connect(self.socket_path)
+        probe.close()
+        print(f"Daemon already running on {self.socket_path}")
+        sys.exit(1)
+      except OSError:
+        os.unlink(self.socket_path)
+    self.server = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+    self.server.bind(self.socket_path)
+    os.chmod(self.socket_path, 0o600)
+    self.server.listen(16)
+
+  def close(self):
+    if self.server:
+      self.server.close()
+      self.server = None
+    if os.path.exists(self.socket_path):
+      os.unlink(self.socket_path)
+
+  def serve_forever(self):
+    # Scripts run inside the daemon (and anything they spawn) must not forward back to it
+    os.environ["RAYCAST_DAEMON"] = "off"
+    self.preload()
+    self.bind()
+    print(f"Listening on {self.socket_path}")
+    try:
+      while True:
+        conn, _ = self.server.accept()
+        with conn:
+          try:
+            self.handle(conn)
+          except (OSError, ValueError) as e:
+            print(f"Request failed: {e!r}")
+        if self._utils_mtimes() != self.utils_mtimes:
+          print("utils/ changed, restarting")
+          self.close()
+          os.execv(sys.executable, [sys.executable, '-m', 'utils.daemon'])
+    except KeyboardInterrupt:
+      pass
+    finally:
+      self.close()
+
+def stop(socket_path=SOCKET_PATH):
+  """Ask a running daemon to shut down. Returns False if none was running."""
+  import json
+  import socket
+
+  conn = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+  try:
+    conn.connect(socket_path)
+    _send(conn, b'r', json.dumps({'stop': True}).encode('utf-8'))
+    while _recv(conn)[0] not in (b'x', None):
+      pass
+    return True
+  except OSError:
+    return False
+  finally:
+    conn.close()
+
+def main():
+  if sys.argv[1:] == ['stop']:
+    print("Stopped" if stop() else "Daemon not running")
+    return
+  os.chdir(REPO_DIR)
+  sys.path.insert(0, REPO_DIR)
+  ScriptDaemon().serve_forever()
+
+if __name__ == "__main__":
+  main()
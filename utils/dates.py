@@ -0,0 +1,233 @@
+import calendar
+import re
+from collections import namedtuple
+from datetime import datetime, time, timedelta
+
+# ------------------- Date Functions -------------------
+#
+# parse_date is table-driven: every pattern is compiled once at import and
+# words resolve through static tables, so a call is a few anchored matches
+# and dict lookups. The month-name and numeric formats use the same field
+# patterns datetime.strptime builds for them, so they accept exactly what
+# the old strptime loop did without raising a ValueError per format tried.
+
+WEEKDAYS = {
+  'monday': 0, 'mon': 0,
+  'tuesday': 1, 'tue': 1, 'tues': 1,
+  'wednesday': 2, 'wed': 2, 'weds': 2,
+  'thursday': 3, 'thu': 3, 'thur': 3, 'thurs': 3,
+  'friday': 4, 'fri': 4,
+  'saturday': 5, 'sat': 5,
+  'sunday': 6, 'sun': 6
+}
+
+# Words that resolve to a fixed number of days from today
+DAY_OFFSETS = {'today': 0, 'tomorrow': 1, 'tmr': 1, 'tmrw': 1, 'later': 5}
+
+_NOW_WORDS = {'now', 'n'}
+_NEXT_WORDS = {'next', 'n'}
+
+_TIME = re.compile(r'^(\d{1,2}):?(\d{2})?\s*(am|pm|a|p)?$')
+_TIME_AMPM = re.compile(r'^(\d{1,2})(?::(\d{2}))?\s*(am|pm|a|p)$')
+_TIME_24H = re.compile(r'^(\d{1,2}):(\d{2})$')
+_ORDINAL = re.compile(r'\b(\d{1,2})(st|nd|rd|th)\b')
+
+def _alternatives(names):
+  # Longest first, like strptime, so "june" isn't cut short at "jun"
+  return '|'.join(re.escape(name.lower()) for name in sorted(names, key=len, reverse=True))
+
+_MONTH_NUMBERS = {
+  name.lower(): number
+  for names in (calendar.month_name, calendar.month_abbr)
+  for number, name in enumerate(names) if name
+}
+
+# strptime directive -> (field, the pattern strptime uses for it)
+_DIRECTIVES = {
+  '%B': ('month_name', _alternatives(calendar.month_name[1:])),
+  '%b': ('month_name', _alternatives(calendar.month_abbr[1:])),
+  '%d': ('day', r'3[0-1]|[1-2]\d|0[1-9]|[1-9]| [1-9]'),
+  '%m': ('month', r'1[0-2]|0[1-9]|[1-9]'),
+  '%Y': ('year', r'\d\d\d\d'),
+}
+
+def _compile_format(fmt):
+  """Compile a strptime format into (regex, field names) matching what strptime accepts."""
+  fields = []
+  def directive(match):
+    field, pattern = _DIRECTIVES[match.group()]
+    fields.append(field)
+    return f'({pattern})'
+  pattern = re.sub(r'%[a-zA-Z]', directive, re.sub(r'\s+', r'\\s+', fmt))
+  return re.compile(pattern, re.IGNORECASE), tuple(fields)
+
+# Month-name formats (June 15, Jun 15th, 15 June, June 15 2027), tried in order
+_MONTH_FORMATS = [_compile_format(fmt) for fmt in (
+  '%B %d %Y', '%b %d %Y',
+  '%B %d, %Y', '%b %d, %Y',
+  '%B %d', '%b %d',
+  '%d %B %Y', '%d %b %Y',
+  '%d %B', '%d %b'
+)]
+
+# Standard numeric formats, matched against the string as given
+_NUMERIC_FORMATS = [_compile_format(fmt) for fmt in ('%Y-%m-%d', '%m/%d/%Y', '%m/%d', '%m-%d')]
+
+def _match_format(formats, text):
+  """Return (year or None, month, day) from the first format that matches all of text."""
+  for regex, fields in formats:
+    m = regex.match(text)
+    # strptime takes the first match and rejects it if anything is left over
+    if not m or m.end() != len(text):
+      continue
+    values = dict(zip(fields, m.groups()))
+    year = int(values['year']) if 'year' in values else None
+    if 'month_name' in values:
+      month = _MONTH_NUMBERS[values['month_name'].lower()]
+    else:
+      month = int(values['month'])
+    day = int(values['day'])
+    # strptime fills in 1900 when there's no year, so Feb 29 never parses without one
+    check_year = 1900 if year is None else year
+    if check_year >= 1 and day <= calendar.monthrange(check_year, month)[1]:
+      return year, month, day
+  return None
+
+def _to_24h(hour, ampm):
+  if ampm and ampm.startswith('p') and hour < 12:
+    return hour + 12
+  if ampm and ampm.startswith('a') and hour == 12:
+    return 0
+  return hour
+
+def _iso(dt):
+  return dt.astimezone().isoformat(timespec='milliseconds')
+
+def _parse_day(s, raw, now):
+  """Resolve the date-only forms of s to a date, or None."""
+  offset = DAY_OFFSETS.get(s)
+  if offset is not None:
+    return (now + timedelta(days=offset)).date()
+
+  # Numeric input as days from now
+  if s.isdigit():
+    return (now + timedelta(days=int(s))).date()
+
+  # Weekday names, each leading "next"/"n" adding a week
+  # e.g. "sat" -> this saturday (or today), "next saturday" -> 1 extra week, "n n wed" -> 2
+  words = s.split()
+  next_count = 0
+  while next_count < len(words) and words[next_count] in _NEXT_WORDS:
+    next_count += 1
+  if len(words) == next_count + 1 and words[-1] in WEEKDAYS:
+    days_ahead = (WEEKDAYS[words[-1]] - now.weekday()) % 7 + 7 * next_count
+    return (now + timedelta(days=days_ahead)).date()
+
+  found = _match_format(_MONTH_FORMATS, _ORDINAL.sub(r'\1', s))
+  if found:
+    year, month, day = found
+    if year is not None:
+      return datetime(year, month, day).date()
+    dt = datetime(now.year, month, day)
+    if dt.date() < now.date():
+      dt = dt.replace(year=now.year + 1)
+    return dt.date()
+
+  found = _match_format(_NUMERIC_FORMATS, raw)
+  if found:
+    year, month, day = found
+    if year is not None:
+      return datetime(year, month, day).date()
+    dt = datetime(now.year, month, day)
+    if dt < now:
+      dt = dt.replace(year=now.year + 1)
+    return dt.date()
+  return None
+
+def _parse(s, raw, now):
+  # Handle dot notation: "." = nearest half hour, ".1" = +1 hour, ".2" = +2 hours, etc.
+  if s.startswith('.'):
+    minute = (now.minute + 15) // 30 * 30
+    dt = now.replace(minute=minute % 60, second=0, microsecond=0)
+    if minute >= 60:
+      dt += timedelta(hours=1)
+    if s[1:]:
+      dt += timedelta(hours=int(s[1:]))
+    return _iso(dt)
+
+  # Handle date + time combo (e.g., "thu 8pm", "9 9am", "tomorrow 3:30pm")
+  last_space = s.rfind(' ')
+  if last_space > 0:
+    time_part = s[last_space+1:].strip()
+    tm = _TIME_AMPM.match(time_part) or _TIME_24H.match(time_part)
+    if tm:
+      date_part = s[:last_space].strip()
+      day = _parse_day(date_part, date_part, now)
+      if day:
+        ampm = tm.group(3) if tm.re is _TIME_AMPM else None
+        clock = time(_to_24h(int(tm.group(1)), ampm), int(tm.group(2) or 0))
+        return _iso(datetime.combine(day, clock))
+
+  # "now" rounds up to the next quarter hour
+  if s in _NOW_WORDS:
+    minute = (now.minute + 14) // 15 * 15
+    dt = now.replace(minute=minute if minute < 60 else 0, second=0, microsecond=0)
+    if minute == 60:
+      dt += timedelta(hours=1)
+    return _iso(dt)
+
+  # Handle time formats (12:30am, 5:00pm, etc.); bare numbers are days, handled below
+  m = None if s.isdigit() else _TIME.match(s)
+  if m:
+    hour = _to_24h(int(m.group(1)), m.group(3))
+    dt = now.replace(hour=hour, minute=int(m.group(2) or 0), second=0, microsecond=0)
+    if dt < now:
+      dt += timedelta(days=1)
+    return _iso(dt)
+
+  day = _parse_day(s, raw, now)
+  return day.strftime('%Y-%m-%d') if day else None
+
+def parse_date(date_str, now=None):
+  """Parse date string into ISO format date or datetime string.
+
+  `now` pins the clock (a naive local datetime); it defaults to the current time.
+  """
+  if not date_str:
+    return None
+
+  try:
+    return _parse(date_str.strip().lower(), date_str, now or datetime.now())
+  except Exception as e:
+    print(f"Error parsing date '{date_str}': {str(e)}")
+    return None
+
+# One parse_dates result. `value` is what parse_date returns for `text`, and
+# `error` says why when that's None.
+ParsedDate = namedtuple('ParsedDate', ['index', 'text', 'value', 'error'])
+
+def _resolve(date_str, now):
+  """Return (value, error) for one string without printing."""
+  if not date_str:
+    return None, "empty"
+  try:
+    value = _parse(date_str.strip().lower(), date_str, now)
+  except Exception as e:
+    return None, str(e)
+  return value, None if value else "unrecognized date"
+
+def parse_dates(date_strs, now=None):
+  """Parse many date strings against one reading of the clock.
+
+  Yields a ParsedDate per input, in input order, as each one is resolved.
+  Every entry sees the same `now` (read when iteration starts unless given),
+  so a batch that straddles midnight can't put "tomorrow" on two different
+  days, and repeated strings are only parsed once.
+  """
+  now = now or datetime.now()
+  seen = {}
+  for index, date_str in enumerate(date_strs):
+    result = seen.get(date_str)
+    if result is None:
+      result = seen[date_str] = _resolve(date_str, now)
+    yield ParsedDate(index, date_str, *result)
@@ -0,0 +1,19 @@
+import os
+
+REPO_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+_loaded = False
+
+def load_env():
+  """Load the repo's .env once per process (python-dotenv is imported on first call)."""
+  global _loaded
+  if _loaded:
+    return
+  from dotenv import load_dotenv
+  load_dotenv(os.path.join(REPO_DIR, ".env"))
+  _loaded = True
+
+def getenv(name, default=None):
+  """os.getenv, after making sure the .env file has been loaded."""
+  load_env()
+  return os.getenv(name, default)
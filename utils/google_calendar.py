@@ -0,0 +1,110 @@
+"""Google Calendar access for create-calendar-event, set up once per process.
+
+The OAuth credentials and the Calendar client are kept for the life of the
+process, so under the script daemon (utils/daemon.py) only the first run
+reads token.json and builds the client, and later runs reuse it along with
+its open HTTPS connection. Expired credentials are refreshed in place.
+
+The client is always built from the discovery document bundled with
+google-api-python-client (static_discovery), so building it never touches
+the network. Google's libraries are imported on first use.
+
+prefetch_service() does all of that on a background thread, so a script can
+overlap it with other slow work (the LLM call) and collect the client, or
+the error, when it needs it. It never opens the browser authorization prompt.
+"""
+
+import json
+import os
+import threading
+from concurrent.futures import Future
+from utils.env import REPO_DIR
+
+CREDENTIALS_PATH = os.getenv(
+  "GOOGLE_CREDENTIALS_PATH", os.path.join(REPO_DIR, "Google Calendar Client Secret.json")
+)
+TOKEN_PATH = os.getenv("GOOGLE_TOKEN_PATH", os.path.join(REPO_DIR, "token.json"))
+SCOPES = ['https://www.googleapis.com/auth/calendar.events']
+
+_lock = threading.Lock()
+_credentials = None
+_service = None  # (credentials it was built with, client)
+
+def _authorize(creds, interactive=True):
+  """Load, refresh or (interactively) create credentials, saving any change to TOKEN_PATH.
+
+  Returns None instead of opening the browser prompt when interactive is False.
+  """
+  from google.auth.transport.requests import Request
+  from google.oauth2.credentials import Credentials
+
+  if not os.path.exists(CREDENTIALS_PATH):
+    raise ValueError(f"Google Calendar credentials not found at {CREDENTIALS_PATH}. Visit https://developers.google.com/calendar/api/quickstart/python to set up.")
+
+  if creds is None and os.path.exists(TOKEN_PATH):
+    with open(TOKEN_PATH) as token_file:
+      creds = Credentials.from_authorized_user_info(json.load(token_file))
+  if creds and creds.valid:
+    return creds
+
+  if creds and creds.expired and creds.refresh_token:
+    print("Refreshing expired Google credentials...")
+    creds.refresh(Request())
+  elif not interactive:
+    return None
+  else:
+    from google_auth_oauthlib.flow import InstalledAppFlow
+    print("Authorizing Google Calendar access...")
+    flow = InstalledAppFlow.from_client_secrets_file(CREDENTIALS_PATH, SCOPES)
+    creds = flow.run_local_server(port=0)
+
+  # Save the refreshed/new credentials
+  with open(TOKEN_PATH, 'w') as token:
+    token.write(creds.to_json())
+  return creds
+
+def get_credentials(interactive=True):
+  """Google API credentials, reused while valid and refreshed when they expire.
+
+  With interactive=False, returns None when only the browser prompt could provide them.
+  """
+  global _credentials
+  with _lock:
+    if _credentials is None or not _credentials.valid:
+      _credentials = _authorize(_credentials, interactive)
+    return _credentials
+
+def get_service(interactive=True):
+  """The Calendar v3 client, built once per process (and again only if re-authorized).
+
+  With interactive=False, returns None when authorizing would need the browser prompt.
+  """
+  global _service
+  credentials = get_credentials(interactive)
+  if credentials is None:
+    return None
+  with _lock:
+    if _service is None or _service[0] is not credentials:
+      from googleapiclient.discovery import build
+      client = build('calendar', 'v3', credentials=credentials, static_discovery=True, cache_discovery=False)
+      _service = (credentials, client)
+    return _service[1]
+
+def prefetch_service():
+  """Start get_service() on a background thread and return a Future for the client.
+
+  Only saved credentials are loaded or refreshed there. If authorizing needs
+  the browser prompt, the Future holds None and the caller should call
+  get_service() once it knows it needs the client. The thread is a daemon, so
+  a script that fails before then can exit without waiting on a refresh.
+  """
+  future = Future()
+
+  def run():
+    try:
+      future.set_result(get_service(interactive=False))
+    except BaseException as e:
+      future.set_exception(e)
+
+  threading.Thread(target=run, name="google-calendar-prefetch", daemon=True).start()
+  return future
@@ -0,0 +1,212 @@
+"""Human-like typing, compiled to a keystroke schedule up front.
+
+compile_schedule() turns text into a list of Keystroke(action, key, at)
+entries, where `at` is seconds from the start, with typos, corrections and
+pauses decided by a seedable RNG. play() then sends each keystroke at its
+absolute deadline on the monotonic clock, so oversleeping one keystroke
+doesn't push back all the ones after it.
+
+Actions:
+  type - type `key` (a character)
+  key  - press and release a special key by its pynput name ('enter', 'tab',
+         'backspace', 'esc', ...), optionally with modifiers ('cmd+down')
+
+Keystrokes go to a sink:
+  pynput    - real key events through pynput (macOS needs accessibility access)
+  recording - records each keystroke with the time it was sent (tests, benchmarks)
+  null      - drops everything
+
+Pick one with RAYCAST_KEYSTROKES, otherwise pynput.
+"""
+
+import os
+import random
+import time
+from collections import namedtuple
+
+Keystroke = namedtuple('Keystroke', ['action', 'key', 'at'])
+
+# Scales every delay; 0.1 = 10x faster than the base 80-150 WPM timings
+SPEED_MULTIPLIER = 0.1
+
+TYPO_RATE = 0.08
+HESITATION_RATE = 0.08
+
+# Common typos based on QWERTY keyboard proximity
+TYPO_MAP = {
+  'a': 'sqz', 'b': 'vng', 'c': 'xvf', 'd': 'sfr', 'e': 'wrd', 'f': 'dgc',
+  'g': 'fht', 'h': 'gjy', 'i': 'uok', 'j': 'hku', 'k': 'jli', 'l': 'ko',
+  'm': 'nj', 'n': 'bmh', 'o': 'ipl', 'p': 'ol', 'q': 'wa', 'r': 'etf',
+  's': 'adw', 't': 'ryg', 'u': 'yij', 'v': 'cbf', 'w': 'qes', 'x': 'zcd',
+  'y': 'tuh', 'z': 'xa',
+}
+
+# Extra pause after these characters, as (min, max) seconds before scaling
+PAUSE_RANGES = {
+  '.': (0.2, 0.5), '!': (0.2, 0.4), '?': (0.2, 0.4),
+  ',': (0.05, 0.15), ';': (0.1, 0.25), ':': (0.1, 0.25),
+  '\n': (0.3, 0.8), '\t': (0.05, 0.15),
+}
+
+SPECIAL_KEYS = {'\n': 'enter', '\t': 'tab'}
+
+_WORD_END = set(' \n\t.,!?;:')
+_HARD_PATTERNS = ('ph', 'gh', 'tion', 'sion', 'ough')
+
+# ------------------- Schedule -------------------
+
+def _hesitation_chance(text, pos):
+  """Chance of pausing at the space at pos before a long or awkward next word."""
+  end = pos + 1
+  while end < len(text) and text[end] not in _WORD_END:
+    end += 1
+  next_word = text[pos + 1:end].lower()
+  if len(next_word) > 10:
+    return 0.1
+  if next_word and any(pattern in next_word for pattern in _HARD_PATTERNS):
+    return 0.05
+  return 0.0
+
+def _stroke(char, at):
+  special = SPECIAL_KEYS.get(char)
+  return Keystroke('key', special, at) if special else Keystroke('type', char, at)
+
+def compile_schedule(text, speed=SPEED_MULTIPLIER, seed=None):
+  """Plan every keystroke for typing text, including typos and their corrections."""
+  rng = random.Random(seed)
+  uniform = rng.uniform
+  schedule = []
+  at = 0.0
+  for pos, char in enumerate(text):
+    # Pause before long or awkward words
+    if char == ' ' and pos > 0:
+      chance = _hesitation_chance(text, pos)
+      if chance and rng.random() < chance:
+        at += uniform(0.2, 0.8) * speed
+
+    typos = TYPO_MAP.get(char.lower()) if char.isalpha() else None
+    if typos and rng.random() < TYPO_RATE:
+      # Hit a neighbouring key, notice, backspace, then type the right one
+      schedule.append(Keystroke('type', rng.choice(typos), at))
+      at += uniform(0.05, 0.2) * speed
+      schedule.append(Keystroke('key', 'backspace', at))
+      # Keep backspace timing reasonable even when sped up
+      at += max(0.01, uniform(0.02, 0.05) * speed)
+      at += uniform(0.02, 0.1) * speed
+    schedule.append(_stroke(char, at))
+
+    # Base typing delay with occasional hesitation, then punctuation pauses
+    at += uniform(0.05, 0.15) * speed
+    if rng.random() < HESITATION_RATE:
+      at += uniform(0.1, 0.4) * speed
+    pause = PAUSE_RANGES.get(char)
+    if pause:
+      at += uniform(*pause) * speed
+  return schedule
+
+def schedule_duration(schedule):
+  """Expected seconds from the first keystroke to the last."""
+  return schedule[-1].at if schedule else 0.0
+
+def format_schedule(schedule):
+  """One line per keystroke, for dry runs."""
+  return '\n'.join(f"{stroke.at:9.3f}  {stroke.action:<4}  {stroke.key!r}" for stroke in schedule)
+
+# ------------------- Sinks -------------------
+
+class KeystrokeSink:
+  """Something that can send keystrokes."""
+
+  def type(self, char):
+    raise NotImplementedError
+
+  def press(self, combo):
+    """Press and release a key, e.g. 'enter' or 'cmd+down'."""
+    raise NotImplementedError
+
+  def send(self, stroke):
+    if stroke.action == 'type':
+      self.type(stroke.key)
+    else:
+      self.press(stroke.key)
+
+class PynputSink(KeystrokeSink):
+  """Sends real key events through pynput."""
+
+  def __init__(self):
+    from pynput.keyboard import Controller, Key
+    self.keyboard = Controller()
+    self.Key = Key
+
+  def type(self, char):
+    self.keyboard.type(char)
+
+  def press(self, combo):
+    *modifiers, name = combo.split('+')
+    key = getattr(self.Key, name)
+    with self.keyboard.pressed(*(getattr(self.Key, m) for m in modifiers)):
+      self.keyboard.press(key)
+      self.keyboard.release(key)
+
+class RecordingSink(KeystrokeSink):
+  """Records (action, key, monotonic time sent) for every keystroke instead of typing."""
+
+  def __init__(self):
+    self.sent = []
+
+  def type(self, char):
+    self.sent.append(('type', char, time.monotonic()))
+
+  def press(self, combo):
+    self.sent.append(('key', combo, time.monotonic()))
+
+  @property
+  def text(self):
+    """What the keystrokes would have left in a text field."""
+    chars = []
+    for action, key, _ in self.sent:
+      if action == 'type':
+        chars.append(key)
+      elif key == 'backspace':
+        if chars:
+          chars.pop()
+      elif key in ('enter', 'tab'):
+        chars.append('\n' if key == 'enter' else '\t')
+    return ''.join(chars)
+
+class NullSink(KeystrokeSink):
+  def type(self, char):
+    pass
+
+  def press(self, combo):
+    pass
+
+SINKS = {
+  'pynput': PynputSink,
+  'recording': RecordingSink,
+  'null': NullSink,
+}
+
+def get_sink():
+  """Create the sink named by RAYCAST_KEYSTROKES (default pynput)."""
+  return SINKS[os.getenv('RAYCAST_KEYSTROKES', 'pynput')]()
+
+# ------------------- Playback -------------------
+
+def play(schedule, sink=None, on_progress=None, progress_every=50):
+  """Send each keystroke at its deadline, measured from when playback starts.
+
+  on_progress(done, total) is called every progress_every keystrokes.
+  Returns the sink.
+  """
+  sink = sink or get_sink()
+  start = time.monotonic()
+  total = len(schedule)
+  for done, stroke in enumerate(schedule, 1):
+    delay = start + stroke.at - time.monotonic()
+    if delay > 0:
+      time.sleep(delay)
+    sink.send(stroke)
+    if on_progress and done % progress_every == 0:
+      on_progress(done, total)
+  return sink
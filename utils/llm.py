@@ -0,0 +1,166 @@
+import functools
+import os
+import threading
+import time
+from utils.env import REPO_DIR, getenv
+
+OPENROUTER_BASE_URL = "https://openrouter.ai/api/v1"
+
+# Responses cached by complete(..., cache=True) / ask(..., cache=True)
+CACHE_PATH = os.getenv("LLM_CACHE_PATH", os.path.join(REPO_DIR, "llm-cache.sqlite3"))
+CACHE_MAX_BYTES = 20 * 1024 * 1024
+CACHE_MAX_AGE = 30 * 24 * 3600
+
+# ------------------- LLM Functions -------------------
+
+# HTTP settings for every client get_client builds. LLM_POOL_SIZE,
+# LLM_CONNECT_TIMEOUT and LLM_READ_TIMEOUT (environment or .env) override the
+# defaults, read when a client is built so .env has been loaded by then.
+POOL_SIZE = 10
+CONNECT_TIMEOUT = 5
+READ_TIMEOUT = 120
+KEEPALIVE_SECONDS = 60
+
+_clients = {}
+_clients_lock = threading.Lock()
+
+def _build_client(api_key, base_url):
+  import httpx
+  from openai import OpenAI
+
+  try:
+    import h2  # noqa: F401 -- httpx only speaks HTTP/2 when h2 is installed
+    http2 = True
+  except ImportError:
+    http2 = False
+
+  pool_size = int(getenv("LLM_POOL_SIZE", POOL_SIZE))
+  timeout = httpx.Timeout(
+    float(getenv("LLM_READ_TIMEOUT", READ_TIMEOUT)), connect=float(getenv("LLM_CONNECT_TIMEOUT", CONNECT_TIMEOUT))
+  )
+  http_client = httpx.Client(
+    http2=http2,
+    timeout=timeout,
+    limits=httpx.Limits(
+      max_connections=pool_size,
+      max_keepalive_connections=pool_size,
+      keepalive_expiry=KEEPALIVE_SECONDS,
+    ),
+  )
+  return OpenAI(base_url=base_url, api_key=api_key, http_client=http_client, timeout=timeout)
+
+def get_client(api_key, base_url=None):
+  """Return the process-wide OpenAI client for (base_url, api_key).
+
+  Each client keeps a pool of keep-alive connections (HTTP/2 when h2 is
+  installed), so every call after the first in a script, or in the daemon
+  (see utils/daemon.py), skips the TCP and TLS handshakes.
+  """
+  key = (base_url, api_key)
+  with _clients_lock:
+    client = _clients.get(key)
+    if client is None:
+      client = _clients[key] = _build_client(api_key, base_url)
+  return client
+
+def close_clients():
+  """Close every pooled client and its connections."""
+  with _clients_lock:
+    clients = list(_clients.values())
+    _clients.clear()
+  for client in clients:
+    client.close()
+
+@functools.lru_cache(maxsize=None)
+def get_cache():
+  from utils.cache import DiskCache
+  return DiskCache(CACHE_PATH, max_bytes=CACHE_MAX_BYTES, max_age=CACHE_MAX_AGE)
+
+class Stream:
+  """A chat completion streamed from OpenRouter.
+
+  Iterate to get text deltas as they arrive. As it goes, `text` collects the
+  whole response, and `time_to_first_token` and `total_time` are set in
+  seconds since the request was sent. With cache=True an identical (model,
+  messages, temperature) request made before is answered from the on-disk
+  cache as a single delta (`cached` is then True), and a fresh response is
+  stored once it has streamed in full. Only cache requests where the same
+  input should give the same answer. If `validate` is given, a response is
+  only stored when validate(text) doesn't raise, and a cached one that fails
+  it is dropped, so a malformed answer isn't replayed. Raises on API errors.
+  """
+
+  def __init__(self, messages, model="anthropic/claude-haiku-4.5", temperature=None, cache=False, validate=None):
+    self.messages = messages
+    self.model = model
+    self.temperature = temperature
+    self.cache = cache
+    self.validate = validate
+    self.text = ''
+    self.cached = False
+    self.time_to_first_token = None
+    self.total_time = None
+
+  def __iter__(self):
+    from utils.cache import cache_key
+
+    start = time.perf_counter()
+    key = cache_key(self.model, self.messages, self.temperature) if self.cache else None
+    hit = get_cache().get(key) if key else None
+    if hit is not None:
+      self.cached = True
+      deltas = [hit.decode('utf-8')]
+    else:
+      deltas = self._request()
+
+    for delta in deltas:
+      if self.time_to_first_token is None:
+        self.time_to_first_token = time.perf_counter() - start
+      self.text += delta
+      yield delta
+    self.total_time = time.perf_counter() - start
+
+    if key and not self._valid():
+      if self.cached:
+        get_cache().delete(key)
+    elif key and not self.cached and self.text:
+      get_cache().put(key, self.text.encode('utf-8'))
+
+  def _valid(self):
+    if self.validate is None:
+      return True
+    try:
+      self.validate(self.text)
+      return True
+    except Exception:
+      return False
+
+  def _request(self):
+    api_key = getenv("OPENROUTER_API_KEY")
+    if not api_key:
+      raise RuntimeError("OPENROUTER_API_KEY not found in environment")
+    options = {} if self.temperature is None else {"temperature": self.temperature}
+    chunks = get_client(api_key, OPENROUTER_BASE_URL).chat.completions.create(
+      model=self.model, messages=self.messages, stream=True, **options
+    )
+    for chunk in chunks:
+      # The final chunk can carry only usage stats and no choices
+      delta = chunk.choices[0].delta.content if chunk.choices else None
+      if delta:
+        yield delta
+
+def complete(messages, model="anthropic/claude-haiku-4.5", temperature=None, cache=False, validate=None):
+  """Run a chat completion and return the whole response text (see Stream)."""
+  return ''.join(Stream(messages, model, temperature, cache, validate))
+
+def ask_stream(prompt, model="anthropic/claude-haiku-4.5", temperature=None, cache=False):
+  """Stream the response to a single prompt. Iterate for text deltas; raises on errors."""
+  return Stream([{"role": "user", "content": prompt}], model, temperature, cache)
+
+def ask(prompt, model="anthropic/claude-haiku-4.5", temperature=None, cache=False):
+  """Send a prompt to OpenRouter and get response."""
+  try:
+    return ''.join(ask_stream(prompt, model, temperature, cache)).strip()
+  except Exception as e:
+    print(f"Error calling OpenRouter API: {str(e)}")
+    return None
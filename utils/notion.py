@@ -0,0 +1,237 @@
+import re
+import threading
+import time
+from datetime import datetime, timedelta
+from email.utils import parsedate_to_datetime
+from utils.env import getenv
+
+NOTION_API_URL = "https://api.notion.com/v1"
+NOTION_VERSION = "2022-06-28"
+
+# Notion answers these when it did nothing with the request, so even a POST is safe to resend
+RETRY_STATUSES = {429, 503}
+
+# Notion's documented average rate limit for an integration
+REQUESTS_PER_SECOND = 3
+
+# ------------------- Notion Client -------------------
+
+class NotionClient:
+  """Notion API client with a pooled keep-alive session, timeouts and retries.
+
+  Rate-limited (429) and unavailable (503) responses are retried with
+  exponential backoff, waiting at least as long as Notion's Retry-After (up
+  to max_backoff). No retry starts more than max_retry_time seconds after
+  the first attempt, so one request() is bounded by roughly that plus one
+  timeout.
+  """
+
+  def __init__(self, token=None, base_url=NOTION_API_URL, timeout=(3.05, 15),
+               max_retries=4, backoff=0.5, max_backoff=30, max_retry_time=45, pool_size=10):
+    import requests
+    from requests.adapters import HTTPAdapter
+
+    self.base_url = base_url.rstrip('/')
+    self.timeout = timeout
+    self.max_retries = max_retries
+    self.backoff = backoff
+    self.max_backoff = max_backoff
+    self.max_retry_time = max_retry_time
+
+    self.session = requests.Session()
+    adapter = HTTPAdapter(pool_connections=1, pool_maxsize=pool_size)
+    self.session.mount('https://', adapter)
+    self.session.mount('http://', adapter)
+    self.session.headers.update({
+      "Authorization": f"Bearer {token or getenv('NOTION_API_TOKEN')}",
+      "Content-Type": "application/json",
+      "Notion-Version": NOTION_VERSION,
+    })
+
+  def _retry_delay(self, response, attempt):
+    """Seconds to wait before the next attempt: backoff, or Retry-After if longer (capped at max_backoff)."""
+    delay = min(self.backoff * 2 ** attempt, self.max_backoff)
+    retry_after = response.headers.get('Retry-After') if response is not None else None
+    if retry_after:
+      try:
+        delay = max(delay, float(retry_after))
+      except ValueError:
+        try:
+          delay = max(delay, (parsedate_to_datetime(retry_after) - datetime.now().astimezone()).total_seconds())
+        except (TypeError, ValueError):
+          pass
+    return min(delay, self.max_backoff)
+
+  def request(self, method, path, **kwargs):
+    """Send a request, retrying rate limits and connection timeouts. Returns the final response."""
+    from requests.exceptions import ConnectTimeout
+
+    url = f"{self.base_url}/{path.lstrip('/')}"
+    deadline = time.monotonic() + self.max_retry_time
+    for attempt in range(self.max_retries + 1):
+      try:
+        response = self.session.request(method, url, timeout=self.timeout, **kwargs)
+      except ConnectTimeout:
+        # Never connected, so nothing was sent
+        if attempt == self.max_retries:
+          raise
+        response = None
+      else:
+        if response.status_code not in RETRY_STATUSES or attempt == self.max_retries:
+          return response
+      delay = self._retry_delay(response, attempt)
+      if time.monotonic() + delay > deadline:
+        if response is None:
+          raise ConnectTimeout(f"Could not connect to {url}")
+        return response
+      time.sleep(delay)
+
+  def create_page(self, data):
+    return self.request('POST', '/pages', json=data)
+
+  def close(self):
+    self.session.close()
+
+class RateLimiter:
+  """Thread-safe limiter that spaces acquire() calls at least 1/rate seconds apart."""
+
+  def __init__(self, rate=REQUESTS_PER_SECOND):
+    self.interval = 1.0 / rate
+    self.next_slot = 0.0
+    self.lock = threading.Lock()
+
+  def acquire(self):
+    with self.lock:
+      now = time.monotonic()
+      slot = max(now, self.next_slot)
+      self.next_slot = slot + self.interval
+    if slot > now:
+      time.sleep(slot - now)
+
+_client = None
+
+def get_client():
+  """Return the process-wide Notion client, so repeated adds reuse one connection."""
+  global _client
+  if _client is None:
+    _client = NotionClient()
+  return _client
+
+# ------------------- Notion Functions -------------------
+
+def build_task_page(task_name, due_date=None):
+  """Build the create-page request body for a task."""
+  # Create the task properties
+  properties = {
+    "Task": {
+      "title": [
+        {
+          "text": {
+            "content": task_name
+          }
+        }
+      ]
+    }
+  }
+
+  # Add due date if provided
+  if due_date:
+    date_payload = {"start": due_date}
+    if "T" in due_date:
+      start_dt = datetime.fromisoformat(due_date)
+      end_dt = start_dt + timedelta(minutes=30)
+      date_payload["end"] = end_dt.isoformat()
+
+    properties["Due date"] = {"date": date_payload}
+
+  # Create the request body
+  return {
+    "parent": {
+      "database_id": getenv("NOTION_DATABASE_ID")
+    },
+    "properties": properties
+  }
+
+def task_url(page_id):
+  """Notion URL for a created page."""
+  return f"https://www.notion.so/jessegilbert/{page_id.replace('-', '')}"
+
+def create_task(task_name, due_date=None, client=None):
+  """Create a task page without printing anything.
+
+  Returns:
+    tuple: (success, task URL or None, error message or None)
+  """
+  try:
+    response = (client or get_client()).create_page(build_task_page(task_name, due_date))
+    if response.status_code == 200:
+      return True, task_url(response.json().get("id", "")), None
+    return False, None, response.json().get("message", "Unknown error")
+  except Exception as e:
+    return False, None, str(e)
+
+def add_task_to_notion(task_name, due_date=None, client=None):
+  """Add a task to the Notion database."""
+  success, url, error = create_task(task_name, due_date, client)
+  if not success:
+    print(f"Error: {error}")
+    return False, None
+
+  print(f"✅ {format_task(task_name, due_date)}")
+  return True, url
+
+def format_task(task_name, due_date=None):
+  """Task name prefixed with how many days away it's due, e.g. '(T-2 days) Call mom'."""
+  if not due_date:
+    return task_name
+  date_part = due_date.split("T")[0] if 'T' in due_date else due_date
+  due_date_obj = datetime.strptime(date_part, "%Y-%m-%d")
+
+  days_from_now = (due_date_obj - datetime.now()).days + 1
+  return f'(T-{days_from_now} day{"" if days_from_now == 1 else "s"}) {task_name}'
+
+# ------------------- Bulk Import -------------------
+
+# List markers to strip from pasted lines: "- ", "* ", "• ", "1. ", "2) ", "[ ] ", "- [x] "
+_LIST_MARKER = re.compile(r'^\s*(?:[-*•]\s+|\d+[.)]\s+)?(?:\[[ xX]?\]\s+)?')
+
+def parse_task_line(line, max_date_words=3, now=None):
+  """Split a pasted line into (task name, due date or None).
+
+  The longest trailing run of up to max_date_words words that parse_date
+  understands becomes the due date ("Email Sam next fri" -> next Friday).
+  Bare numbers are left alone so "Read chapter 3" isn't due in three days.
+  Pass the same `now` for every line of a paste so they share one clock.
+  """
+  from utils.dates import parse_dates
+
+  words = _LIST_MARKER.sub('', line).split()
+  lengths = [n for n in range(min(max_date_words, len(words) - 1), 0, -1)
+             if not ' '.join(words[-n:]).isdigit()]
+  candidates = (' '.join(words[-n:]) for n in lengths)
+  # parse_dates is lazy, so shorter candidates are only parsed if longer ones fail
+  for n, parsed in zip(lengths, parse_dates(candidates, now)):
+    if parsed.value:
+      return ' '.join(words[:-n]), parsed.value
+  return ' '.join(words), None
+
+def add_tasks_to_notion(tasks, max_workers=4, rate=REQUESTS_PER_SECOND):
+  """Create many tasks concurrently while staying under Notion's rate limit.
+
+  Args:
+    tasks: iterable of (task name, due date or None)
+
+  Returns:
+    list: (success, url, error) for each task, in input order
+  """
+  from concurrent.futures import ThreadPoolExecutor
+
+  client = get_client()
+  limiter = RateLimiter(rate)
+
+  def submit(task):
+    limiter.acquire()
+    return create_task(task[0], task[1], client)
+
+  with ThreadPoolExecutor(max_workers=max_workers) as pool:
+    return list(pool.map(submit, tasks))
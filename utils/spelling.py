@@ -0,0 +1,569 @@
+"""English spell checking over memory-mapped indexes.
+
+pyspellchecker's SpellChecker() decompresses its English dictionary and
+builds a ~160k-entry Python dict on every construction, which costs a hotkey
+~0.3s and ~50MB before it has checked a single word. Here that dictionary is
+converted once into a flat index file (an open-addressing hash table of
+word offsets plus the word bytes and their counts) and memory-mapped on
+first use. Nothing is parsed at load time, only the pages a lookup touches
+are read, and every script process shares the same page cache.
+
+Corrections come from a second index, SymSpell style: every dictionary word
+is stored under each string left after deleting up to two characters from
+its first PREFIX_LENGTH characters. A misspelling's own deletes then lead
+straight to every word within two edits, instead of generating and looking
+up the ~100k strings two edits away at query time the way SpellChecker does.
+That index is only built and mapped the first time a word needs correcting.
+
+Both indexes are rebuilt automatically whenever the installed pyspellchecker
+dictionary changes (or ahead of time with `.venv/bin/python -m utils.spelling
+build`). Words and ranking are the same as SpellChecker(): the most frequent
+known word at edit distance 1, else 2, preferring candidates that only
+differ in accents.
+"""
+
+import functools
+import json
+import mmap
+import os
+import re
+import string
+import sys
+import tempfile
+import unicodedata
+import zlib
+from array import array
+from bisect import bisect_left
+from collections import namedtuple
+from utils.env import REPO_DIR
+
+INDEX_PATH = os.getenv("SPELL_INDEX_PATH", os.path.join(REPO_DIR, "spell-words.idx"))
+DELETES_PATH = os.getenv("SPELL_DELETES_PATH", os.path.join(REPO_DIR, "spell-deletes.idx"))
+
+# fix_text() only corrects a typo itself when the best word is one edit away
+# and at least this many times as common as the runner-up; anything else is
+# left to the LLM. That ratio only picks between corrections, so unknown words
+# that look deliberate (see _plausible_fix) go to the LLM too.
+MIN_FREQUENCY_RATIO = 10
+
+# An unknown word that is a known word plus -s or -d is only taken as valid
+# when that stem has at least 4 letters and is rarer than this. Inflections of
+# common words are all in the dictionary, so "ths", "ands" or "wered" are typos.
+MAX_STEM_FREQUENCY = 50000
+
+# fix_word() corrects a capitalized lone word (Wierd) only to a word seen at
+# least this many times; rarer fixes are more likely a brand or name misread
+# (Venmo -> venom)
+MIN_CAPITALIZED_FIX_FREQUENCY = 10000
+
+# Only deletes of a word's first PREFIX_LENGTH characters are indexed, which
+# keeps the deletes index ~25MB; candidates are then checked on whole words
+PREFIX_LENGTH = 7
+MAX_DISTANCE = 2
+
+_WORDS_MAGIC = b'RSPW'
+_DELETES_MAGIC = b'RSPD'
+_VERSION = 1
+_HEADER = 12  # magic, version, metadata length
+
+# ------------------- Index Files -------------------
+
+def _source_path(language='en'):
+  """Path of pyspellchecker's bundled frequency dictionary, without importing it."""
+  import importlib.util
+  spec = importlib.util.find_spec('spellchecker')
+  return os.path.join(os.path.dirname(spec.origin), 'resources', f'{language}.json.gz')
+
+def _signature(path):
+  stat = os.stat(path)
+  return [stat.st_size, stat.st_mtime_ns]
+
+def _write_index(path, magic, meta, arrays, tail=b''):
+  """Atomically write header + JSON metadata + uint32 arrays + tail bytes."""
+  meta = json.dumps(meta).encode('utf-8')
+  meta += b' ' * (-(_HEADER + len(meta)) % 4)  # keep the arrays 4-byte aligned
+  fd, temp_path = tempfile.mkstemp(dir=os.path.dirname(path) or '.', suffix='.tmp')
+  try:
+    with os.fdopen(fd, 'wb') as f:
+      f.write(magic + array('I', [_VERSION, len(meta)]).tobytes() + meta)
+      for part in arrays:
+        f.write(part.tobytes())
+      f.write(tail)
+    os.replace(temp_path, path)
+  except BaseException:
+    os.unlink(temp_path)
+    raise
+
+def _open_index(path, magic, sizes):
+  """Map an index file. Returns (mmap, meta, uint32 views of the given lengths, end offset)."""
+  with open(path, 'rb') as f:
+    mapped = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+  if mapped[:4] != magic:
+    raise ValueError(f"{path} is not a {magic.decode()} index")
+  version, meta_length = memoryview(mapped)[4:_HEADER].cast('I')
+  if version != _VERSION:
+    raise ValueError(f"{path} has index version {version}, expected {_VERSION}")
+  meta = json.loads(mapped[_HEADER:_HEADER + meta_length])
+
+  view = memoryview(mapped)
+  start = _HEADER + meta_length
+  arrays = []
+  for size in sizes(meta):
+    arrays.append(view[start:start + 4 * size].cast('I'))
+    start += 4 * size
+  return mapped, meta, arrays, start
+
+def _load_frequencies(source):
+  """Word -> count, lowercased and merged the way SpellChecker loads it."""
+  import gzip
+  with gzip.open(source, 'rt', encoding='utf-8') as f:
+    data = json.load(f)
+  counts = {}
+  for word, count in data.items():
+    word = word.lower()
+    counts[word] = counts.get(word, 0) + count
+  return counts
+
+def build_index(path=INDEX_PATH, source=None):
+  """Write the word index for pyspellchecker's dictionary to path."""
+  source = source or _source_path()
+  counts = _load_frequencies(source)
+  words = sorted(counts)
+  encoded = [word.encode('utf-8') for word in words]
+
+  slots = 1
+  while slots < len(words) * 2:
+    slots *= 2
+  mask = slots - 1
+  table = array('I', bytes(4 * slots))
+  offsets = array('I', [0])
+  for index, key in enumerate(encoded):
+    offsets.append(offsets[-1] + len(key))
+    slot = zlib.crc32(key) & mask
+    while table[slot]:
+      slot = (slot + 1) & mask
+    table[slot] = index + 1  # 0 marks an empty slot
+  frequencies = array('I', (counts[word] for word in words))
+
+  meta = {
+    'source': _signature(source),
+    'count': len(words),
+    'slots': slots,
+    'total_words': sum(counts.values()),
+    'longest_word_length': max(map(len, words)),
+  }
+  _write_index(path, _WORDS_MAGIC, meta, (table, offsets, frequencies), b''.join(encoded))
+
+def _deletes(word, distance):
+  """word plus every string left after deleting up to distance of its characters."""
+  found = {word}
+  level = [word]
+  for _ in range(distance):
+    level = {part[:i] + part[i + 1:] for part in level for i in range(len(part))} - found
+    found |= level
+  return found
+
+def _key(text):
+  return zlib.crc32(text.encode('utf-8'))
+
+def build_deletes(dictionary, path=DELETES_PATH):
+  """Write the deletes index (delete hash -> word indexes) for dictionary to path.
+
+  Deletes are stored by 32-bit hash; the rare collisions only add candidates
+  that fail the distance check.
+  """
+  # Words sharing a prefix share its deletes, so work them out once per prefix
+  by_prefix = {}
+  for index, word in enumerate(dictionary.words()):
+    by_prefix.setdefault(word[:PREFIX_LENGTH], []).append(index)
+
+  pairs = array('Q')
+  for prefix, indexes in by_prefix.items():
+    for delete in _deletes(prefix, MAX_DISTANCE):
+      high = _key(delete) << 32
+      pairs.extend(high | index for index in indexes)
+  pairs = sorted(pairs)
+
+  keys = array('I')
+  starts = array('I')
+  postings = array('I', (pair & 0xFFFFFFFF for pair in pairs))
+  previous = None
+  for position, pair in enumerate(pairs):
+    if pair >> 32 != previous:
+      previous = pair >> 32
+      keys.append(previous)
+      starts.append(position)
+  starts.append(len(pairs))
+
+  meta = {
+    'source': dictionary.meta['source'],
+    'prefix_length': PREFIX_LENGTH,
+    'max_distance': MAX_DISTANCE,
+    'keys': len(keys),
+    'postings': len(postings),
+  }
+  _write_index(path, _DELETES_MAGIC, meta, (keys, starts, postings))
+
+# ------------------- Edit Distance -------------------
+
+def _within(a, b, distance):
+  """True if a and b are at most distance inserts, deletes, substitutions and
+  adjacent swaps apart (Damerau-Levenshtein, for distance <= 2)."""
+  if abs(len(a) - len(b)) > distance:
+    return False
+  # A shared prefix or suffix never changes the distance
+  start = 0
+  while start < len(a) and start < len(b) and a[start] == b[start]:
+    start += 1
+  end = 0
+  while end < len(a) - start and end < len(b) - start and a[-1 - end] == b[-1 - end]:
+    end += 1
+  a, b = a[start:len(a) - end], b[start:len(b) - end]
+  if not a or not b:
+    return len(a) + len(b) <= distance
+  if distance <= 1:
+    # What's left differs at both ends, so one edit has to cover all of it
+    return distance == 1 and (len(a) == len(b) == 1 or (len(a) == len(b) == 2 and a == b[::-1]))
+
+  # a[0] != b[0], so the first edit has to happen right here
+  rest = distance - 1
+  if _within(a[1:], b, rest) or _within(a, b[1:], rest) or _within(a[1:], b[1:], rest):
+    return True
+  if a[1:2] == b[:1] and a[:1] == b[1:2] and _within(a[2:], b[2:], rest):
+    return True
+  # A swap with one character deleted or inserted between ('cxa' -> 'ac')
+  return (a[2:3] == b[:1] and a[:1] == b[1:2] and a[3:] == b[2:]) or (
+    a[1:2] == b[:1] and a[:1] == b[2:3] and a[2:] == b[3:]
+  )
+
+# ------------------- Lookup -------------------
+
+class DeleteIndex:
+  """Read-only view of a deletes index file."""
+
+  def __init__(self, path=DELETES_PATH):
+    self._map, self.meta, (self._keys, self._starts, self._postings), _ = _open_index(
+      path, _DELETES_MAGIC, lambda meta: (meta['keys'], meta['keys'] + 1, meta['postings'])
+    )
+    # Lookups jump around the file; don't read ahead around every page they touch
+    if hasattr(mmap, 'MADV_RANDOM'):
+      self._map.madvise(mmap.MADV_RANDOM)
+
+  def lookup(self, delete):
+    """Indexes of the words that have delete among their prefix deletes."""
+    key = _key(delete)
+    position = bisect_left(self._keys, key)
+    if position == len(self._keys) or self._keys[position] != key:
+      return ()
+    return self._postings[self._starts[position]:self._starts[position + 1]]
+
+class SpellDictionary:
+  """Read-only view of a word index file. Words are looked up lowercased."""
+
+  def __init__(self, path=INDEX_PATH, deletes_path=DELETES_PATH):
+    self._map, self.meta, (self._table, self._offsets, self._frequencies), self._words_start = _open_index(
+      path, _WORDS_MAGIC, lambda meta: (meta['slots'], meta['count'] + 1, meta['count'])
+    )
+    self.deletes_path = deletes_path
+    self.total_words = self.meta['total_words']
+    self.longest_word_length = self.meta['longest_word_length']
+    self._mask = self.meta['slots'] - 1
+
+  def __len__(self):
+    return self.meta['count']
+
+  def _find(self, word):
+    """Index of word in the table, or -1."""
+    key = word.encode('utf-8')
+    mask, table, offsets = self._mask, self._table, self._offsets
+    slot = zlib.crc32(key) & mask
+    while True:
+      index = table[slot]
+      if not index:
+        return -1
+      index -= 1
+      start = offsets[index]
+      if offsets[index + 1] - start == len(key):
+        start += self._words_start
+        if self._map[start:start + len(key)] == key:
+          return index
+      slot = (slot + 1) & mask
+
+  def __contains__(self, word):
+    return self._find(word.lower()) >= 0
+
+  def frequency(self, word):
+    """How often word appears in the corpus (0 if unknown)."""
+    index = self._find(word.lower())
+    return self._frequencies[index] if index >= 0 else 0
+
+  def word(self, index):
+    start = self._words_start
+    return self._map[start + self._offsets[index]:start + self._offsets[index + 1]].decode('utf-8')
+
+  def words(self):
+    """Every word in the dictionary, in sorted order."""
+    return (self.word(index) for index in range(len(self)))
+
+  @functools.cached_property
+  def deletes(self):
+    """The deletes index for this dictionary, built on first use."""
+    try:
+      index = DeleteIndex(self.deletes_path)
+      if index.meta['source'] == self.meta['source'] and index.meta['prefix_length'] == PREFIX_LENGTH:
+        return index
+    except (OSError, ValueError):
+      pass
+    build_deletes(self, self.deletes_path)
+    return DeleteIndex(self.deletes_path)
+
+  # ------------------- Correction -------------------
+
+  def should_check(self, word):
+    """False for things that aren't words to correct (numbers, lone punctuation, huge tokens)."""
+    if len(word) == 1 and word in string.punctuation:
+      return False
+    if len(word) > self.longest_word_length + 3:
+      return False
+    if word.lower() in ('nan', 'inf', 'infinity'):
+      return True
+    try:
+      float(word)
+      return False
+    except ValueError:
+      return True
+
+  def known(self, words):
+    """The subset of words that are in the dictionary."""
+    return {word for word in (w.lower() for w in words) if self._find(word) >= 0 and self.should_check(word)}
+
+  def within(self, word, distance):
+    """Dictionary words at most distance edits from word (lowercase)."""
+    indexes = set()
+    for delete in _deletes(word[:PREFIX_LENGTH], distance):
+      indexes.update(self.deletes.lookup(delete))
+    # Each edit adds or removes at most two distinct letters, which rules
+    # out most candidates before the (slower) exact check
+    letters = set(word)
+    found = set()
+    for index in indexes:
+      candidate = self.word(index)
+      if len(letters.symmetric_difference(candidate)) <= 2 * distance and _within(word, candidate, distance):
+        found.add(candidate)
+    return found
+
+  def candidates(self, word):
+    """Known words closest to word (itself if known), or an empty set."""
+    word = word.lower()
+    if self.known([word]) or not self.should_check(word):
+      return {word}
+    for distance in range(1, MAX_DISTANCE + 1):
+      found = {candidate for candidate in self.within(word, distance) if self.should_check(candidate)}
+      if found:
+        return found
+    return set()
+
+  def correction(self, word):
+    """The most probable spelling of word, or None if nothing is close."""
+    candidates = self.candidates(word)
+    if not candidates:
+      return None
+    # Ties go to the alphabetically first word, so results are repeatable
+    candidates = sorted(candidates)
+    plain = _strip_accents(word.lower())
+    accent_only = [c for c in candidates if _strip_accents(c) == plain]
+    return max(accent_only or candidates, key=self.frequency)
+
+def _strip_accents(text):
+  decomposed = unicodedata.normalize('NFKD', text)
+  return ''.join(c for c in decomposed if not unicodedata.combining(c))
+
+def _index_is_current(path, source):
+  try:
+    dictionary = SpellDictionary(path)
+  except (OSError, ValueError):
+    return None
+  return dictionary if dictionary.meta['source'] == _signature(source) else None
+
+@functools.lru_cache(maxsize=None)
+def get_dictionary(path=INDEX_PATH):
+  """The shared English dictionary, building its index on first use."""
+  source = _source_path()
+  dictionary = _index_is_current(path, source)
+  if dictionary is None:
+    build_index(path, source)
+    dictionary = SpellDictionary(path)
+  return dictionary
+
+# ------------------- Text -------------------
+
+TextFix = namedtuple('TextFix', ['text', 'changes', 'confident', 'reason'])
+
+_WORD = re.compile(r"\w[\w']*\w|\w")
+_CHUNK = re.compile(r'\S+')
+# Chunks like URLs, emails, paths, identifiers and numbers are left alone
+_CODE_LIKE = re.compile(r"[\d/@_=<>`\\{}|~#$%^*+\[\]]|[a-z][A-Z]")
+_BULLET = ' \t-*•>0123456789.)'
+
+# Problems a word-by-word spell check can't fix, so the LLM should see the text
+_GRAMMAR = [
+  (re.compile(r"\b(\w+)\s+\1\b", re.IGNORECASE), "repeated word"),
+  (re.compile(r"\b(?:could|should|would|must|might)\s+of\b", re.IGNORECASE), "'of' instead of 'have'"),
+  (re.compile(r"\ban\s+[b-df-hj-np-tv-z]\w", re.IGNORECASE), "'an' before a consonant"),
+  (re.compile(r"\ba\s+[aeio]\w", re.IGNORECASE), "'a' before a vowel"),
+  (re.compile(r"(?<![\w'])i(?![\w'])"), "lowercase 'i'"),
+  (re.compile(
+    r"\b(?:cant|wont|dont|didnt|doesnt|isnt|wasnt|arent|werent|couldnt|shouldnt|wouldnt|"
+    r"im|ive|youre|theyre|thats|whats|lets)\b", re.IGNORECASE
+  ), "missing apostrophe"),
+  (re.compile(r"\s[,.;:!?](?!\S)"), "space before punctuation"),
+]
+
+def _starts_sentence(text, start):
+  before = text[:start].rstrip()
+  if not before or before[-1] in '.!?':
+    return True
+  line = text[:start].rsplit('\n', 1)[-1]
+  return not line.strip(_BULLET)
+
+def _match_case(original, word):
+  return word[0].upper() + word[1:] if original[0].isupper() else word
+
+# Spellings the dictionary doesn't have but are valid: British forms of a
+# known American one (colour, realise, centre, travelled)
+_VARIANTS = [
+  (re.compile(r'our(s|ed|ing|ite|ites|able|ful|er|ers|y)?$'), r'or\1'),
+  (re.compile(r'is(e|es|ed|ing|ation|ations)$'), r'iz\1'),
+  (re.compile(r'ys(e|es|ed|ing)$'), r'yz\1'),
+  (re.compile(r'([^aeiou])re(s?)$'), r'\1er\2'),
+  (re.compile(r'ence$'), 'ense'),
+  (re.compile(r'mme(s?)$'), r'm\1'),
+  (re.compile(r'll(ed|ing|er|ers)$'), r'l\1'),
+  (re.compile(r'llery$'), 'lry'),
+  (re.compile(r'ium$'), 'um'),
+  (re.compile(r'ogue(s?)$'), r'og\1'),
+]
+
+# Inflections of a known word the dictionary lacks (podcasts, googled); see
+# MAX_STEM_FREQUENCY
+_INFLECTION = re.compile(r'(?<=e)d$|(?<!s)s$')
+
+def _is_variant(dictionary, word):
+  for pattern, replacement in _VARIANTS:
+    variant, count = pattern.subn(replacement, word)
+    if count and variant in dictionary:
+      return True
+  stem = _INFLECTION.sub('', word)
+  return stem != word and len(stem) >= 4 and 0 < dictionary.frequency(stem) < MAX_STEM_FREQUENCY
+
+def _plausible_fix(word, fix):
+  """Whether correcting unknown lowercase `word` to `fix` looks like fixing a typo.
+
+  Words with no vowel (thx, msg) and short words (lol, wifi) are more often
+  slang than typos, so they only count when the fix swaps two neighbouring
+  letters (teh, jsut). Fixes that change the first letter (figma -> sigma)
+  or only add letters at the end (convo -> convoy) don't count either: typos
+  rarely start wrong, and clipped words are usually deliberate.
+  """
+  if not set(word) & set('aeiouy') or fix[0] != word[0] or fix.startswith(word):
+    return False
+  return len(word) > 4 or (len(fix) == len(word) and sorted(fix) == sorted(word))
+
+def _confident_fix(dictionary, word, min_ratio=MIN_FREQUENCY_RATIO):
+  """The correction for a lowercase unknown word if there's a clear, plausible winner, else None."""
+  candidates = [c for c in dictionary.within(word, 1) if dictionary.should_check(c)]
+  ranked = sorted(candidates, key=lambda c: (-dictionary.frequency(c), c))
+  if not ranked:
+    return None
+  if len(ranked) > 1 and dictionary.frequency(ranked[0]) < min_ratio * dictionary.frequency(ranked[1]):
+    return None
+  return ranked[0] if _plausible_fix(word, ranked[0]) else None
+
+def fix_text(text, dictionary=None, min_ratio=MIN_FREQUENCY_RATIO):
+  """Fix clear-cut misspellings in text without touching anything else.
+
+  Returns TextFix(text, changes, confident, reason). confident is True only
+  when at least one typo was fixed and nothing else looked wrong; otherwise
+  reason says why (an ambiguous typo, a likely grammar problem, a word that
+  may be slang or a name, or no typo found at all, since the text may still
+  have mistakes a dictionary can't see) and the text should go to the LLM
+  instead. Acronyms, capitalized words
+  mid-sentence (names), British spellings and code-like chunks are never
+  changed. min_ratio=1 fixes a typo to its most common neighbour even when
+  the runner-up is close.
+  """
+  for pattern, problem in _GRAMMAR:
+    if pattern.search(text):
+      return TextFix(text, [], False, problem)
+
+  dictionary = dictionary or get_dictionary()
+  pieces = []
+  changes = []
+  last = 0
+  for chunk in _CHUNK.finditer(text):
+    if _CODE_LIKE.search(chunk.group()):
+      continue
+    for match in _WORD.finditer(chunk.group()):
+      word = match.group()
+      if word in dictionary or not dictionary.should_check(word) or _is_variant(dictionary, word.lower()):
+        continue
+      start = chunk.start() + match.start()
+      if (len(word) > 1 and word.isupper()) or (word[0].isupper() and not _starts_sentence(text, start)):
+        continue
+      # A capitalized unknown word starting a sentence may be a name or brand
+      fix = None if word[0].isupper() else _confident_fix(dictionary, word, min_ratio)
+      if fix is None:
+        return TextFix(text, changes, False, f"not sure how to fix {word!r}")
+      fix = _match_case(word, fix)
+      pieces += [text[last:start], fix]
+      last = start + len(word)
+      changes.append((word, fix))
+  if not changes:
+    return TextFix(text, [], False, "no clear-cut typos")
+  pieces.append(text[last:])
+  return TextFix(''.join(pieces), changes, True, None)
+
+def fix_word(text, dictionary=None, min_ratio=1):
+  """text (one word, maybe with punctuation around it) with its typo fixed, or None.
+
+  The lone-word counterpart of fix_text: the fix is the dictionary's
+  correction(), so typos two edits away are fixed too, and capitalized words
+  are fixed (keeping their case) when the fix is common enough, see
+  MIN_CAPITALIZED_FIX_FREQUENCY. None when the word is known, a British
+  spelling or inflection, an acronym or code-like, when the runner-up is
+  within min_ratio of the correction's frequency, or when the fix doesn't
+  look like a typo (see _plausible_fix). A fix two edits away must also use
+  the same letters (tommorow -> tomorrow); otherwise it's usually an
+  unrelated word (selfie -> selfish, hashtag -> hashing).
+  """
+  words = list(_WORD.finditer(text))
+  if len(words) != 1 or _CODE_LIKE.search(text):
+    return None
+  match = words[0]
+  word = match.group()
+  lower = word.lower()
+  dictionary = dictionary or get_dictionary()
+  if lower in dictionary or not dictionary.should_check(word) or _is_variant(dictionary, lower):
+    return None
+  if len(word) > 1 and word.isupper():
+    return None
+  fix = dictionary.correction(lower)
+  if fix is None or not _plausible_fix(lower, fix):
+    return None
+  if not _within(lower, fix, 1) and set(fix) != set(lower):
+    return None
+  frequency = dictionary.frequency(fix)
+  if word[0].isupper() and frequency < MIN_CAPITALIZED_FIX_FREQUENCY:
+    return None
+  runner_up = max((dictionary.frequency(c) for c in dictionary.candidates(lower) if c != fix), default=0)
+  if frequency < min_ratio * runner_up:
+    return None
+  return text[:match.start()] + _match_case(word, fix) + text[match.end():]
+
+if __name__ == "__main__":
+  if sys.argv[1:] != ['build']:
+    print("Usage: python -m utils.spelling build")
+    sys.exit(1)
+  dictionary = get_dictionary()
+  print(f"{INDEX_PATH}: {len(dictionary)} words")
+  print(f"{DELETES_PATH}: {dictionary.deletes.meta['keys']} deletes")
@@ -0,0 +1,322 @@
+"""Durable local queue (SQLite) for Notion task creation.
+
+add-to-notion writes the task here and returns straight away; a background
+flusher then creates the pages, retrying with backoff until Notion accepts
+them, and posts a notification with the page URL when each one lands.
+
+Each task gets an idempotency key (its row id). Before a task is sent again
+after an attempt whose outcome is unknown (timeout, crash mid-request), the
+flusher looks for the page that attempt may have created, so a task is never
+created twice. If NOTION_SPOOL_ID_PROPERTY names a text property in the
+database, every page is stamped with its row id there and found by it.
+Otherwise the flusher takes the oldest page with the same title created
+since that attempt that no other row has already recorded. Rows are leased
+while being sent, so several flushers can run at once without sending the
+same task twice.
+
+  .venv/bin/python -m utils.spool list          # show queued/failed/done tasks
+  .venv/bin/python -m utils.spool flush         # send everything due now
+  .venv/bin/python -m utils.spool retry [ID]    # requeue failed tasks
+"""
+
+import os
+import sqlite3
+import subprocess
+import sys
+import time
+import uuid
+from contextlib import closing
+from datetime import datetime, timezone
+from utils.env import REPO_DIR, getenv
+
+SPOOL_PATH = os.getenv("NOTION_SPOOL_PATH", os.path.join(REPO_DIR, "notion-spool.sqlite3"))
+
+# Seconds a flusher may hold a task before another flusher can take it over.
+# The lease is renewed before each request, and one NotionClient request
+# (retries included) takes at most ~65s, so a live flusher never loses it.
+LEASE_SECONDS = 120
+MAX_ATTEMPTS = 10
+RETRY_BASE_SECONDS = 5
+RETRY_MAX_SECONDS = 15 * 60
+
+# Optional rich text property in the task database that pages are stamped with their row id in
+ID_PROPERTY = os.getenv("NOTION_SPOOL_ID_PROPERTY")
+
+# Statuses that mean the request itself is wrong, so resending won't help
+PERMANENT_STATUSES = {400, 401, 403, 404}
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS tasks (
+  id TEXT PRIMARY KEY,
+  task_name TEXT NOT NULL,
+  due_date TEXT,
+  state TEXT NOT NULL DEFAULT 'pending',
+  attempts INTEGER NOT NULL DEFAULT 0,
+  next_attempt_at REAL NOT NULL,
+  lease_until REAL,
+  first_sent_at TEXT,
+  url TEXT,
+  last_error TEXT,
+  created_at REAL NOT NULL
+)
+"""
+
+def connect(path=SPOOL_PATH):
+  conn = sqlite3.connect(path, timeout=10, isolation_level=None)
+  conn.row_factory = sqlite3.Row
+  conn.execute("PRAGMA journal_mode=WAL")
+  conn.execute(_SCHEMA)
+  return conn
+
+# ------------------- Queue -------------------
+
+def enqueue_task(task_name, due_date=None, path=SPOOL_PATH):
+  """Durably queue a task and return its idempotency key."""
+  task_id = uuid.uuid4().hex
+  now = time.time()
+  with closing(connect(path)) as conn:
+    conn.execute(
+      "INSERT INTO tasks (id, task_name, due_date, next_attempt_at, created_at) VALUES (?, ?, ?, ?, ?)",
+      (task_id, task_name, due_date, now, now)
+    )
+  return task_id
+
+def _claim(conn):
+  """Lease the next due task, or return None if nothing is due."""
+  now = time.time()
+  conn.execute("BEGIN IMMEDIATE")
+  try:
+    row = conn.execute(
+      "SELECT * FROM tasks WHERE state = 'pending' AND next_attempt_at <= ? "
+      "AND (lease_until IS NULL OR lease_until < ?) ORDER BY created_at LIMIT 1",
+      (now, now)
+    ).fetchone()
+    if row:
+      conn.execute("UPDATE tasks SET lease_until = ? WHERE id = ?", (now + LEASE_SECONDS, row['id']))
+    conn.execute("COMMIT")
+  except BaseException:
+    conn.execute("ROLLBACK")
+    raise
+  return row
+
+def _renew(conn, task_id):
+  """Extend our lease before a request. Returns False if it already ran out (another flusher may own the task)."""
+  now = time.time()
+  cursor = conn.execute(
+    "UPDATE tasks SET lease_until = ? WHERE id = ? AND lease_until >= ?", (now + LEASE_SECONDS, task_id, now)
+  )
+  return cursor.rowcount == 1
+
+def _finish(conn, task_id, **fields):
+  fields['lease_until'] = None
+  assignments = ', '.join(f"{name} = ?" for name in fields)
+  conn.execute(f"UPDATE tasks SET {assignments} WHERE id = ?", (*fields.values(), task_id))
+
+# ------------------- Flushing -------------------
+
+def _find_existing_pages(client, row):
+  """URLs of pages (oldest first) that an earlier attempt at this row may have created."""
+  from utils.notion import task_url
+
+  if ID_PROPERTY:
+    match = {"property": ID_PROPERTY, "rich_text": {"equals": row['id']}}
+  else:
+    # Notion's created_time is truncated to the minute
+    since = datetime.fromisoformat(row['first_sent_at']).replace(second=0, microsecond=0)
+    match = {"and": [
+      {"property": "Task", "title": {"equals": row['task_name']}},
+      {"timestamp": "created_time", "created_time": {"on_or_after": since.isoformat()}},
+    ]}
+  response = client.request('POST', f"/databases/{getenv('NOTION_DATABASE_ID')}/query", json={
+    "filter": match,
+    "sorts": [{"timestamp": "created_time", "direction": "ascending"}],
+    "page_size": 100,
+  })
+  if response.status_code != 200:
+    raise RuntimeError(response.json().get("message", f"HTTP {response.status_code}"))
+  return [task_url(page["id"]) for page in response.json().get("results", [])]
+
+def _adopt_page(conn, row, urls, attempts):
+  """Mark the row done with the first of urls no other row has recorded. Returns that URL or None."""
+  conn.execute("BEGIN IMMEDIATE")
+  try:
+    claimed = {r['url'] for r in conn.execute(
+      "SELECT url FROM tasks WHERE url IS NOT NULL AND id != ?", (row['id'],)
+    )}
+    url = next((u for u in urls if u not in claimed), None)
+    if url:
+      _finish(conn, row['id'], state='done', url=url, attempts=attempts, last_error=None)
+    conn.execute("COMMIT")
+  except BaseException:
+    conn.execute("ROLLBACK")
+    raise
+  return url
+
+def _record_created(conn, row, url, attempts):
+  """Mark the row done with the page it just created.
+
+  Another flusher retrying a same-titled row may have adopted this page
+  while the request was in flight; that row is requeued to look again.
+  """
+  conn.execute("BEGIN IMMEDIATE")
+  try:
+    conn.execute(
+      "UPDATE tasks SET state = 'pending', url = NULL, next_attempt_at = ? WHERE url = ? AND id != ?",
+      (time.time(), url, row['id'])
+    )
+    _finish(conn, row['id'], state='done', url=url, attempts=attempts, last_error=None)
+    conn.execute("COMMIT")
+  except BaseException:
+    conn.execute("ROLLBACK")
+    raise
+
+def _send(conn, client, row):
+  """Try to create one task's page. Returns (state, url or error message)."""
+  from utils.notion import build_task_page, task_url
+
+  attempts = row['attempts'] + 1
+  try:
+    # A previous attempt may have reached Notion even though we never saw the answer
+    if row['first_sent_at']:
+      if not _renew(conn, row['id']):
+        return 'pending', "lease expired, left to another flusher"
+      url = _adopt_page(conn, row, _find_existing_pages(client, row), attempts)
+      if url:
+        return 'done', url
+    else:
+      conn.execute(
+        "UPDATE tasks SET first_sent_at = ? WHERE id = ?",
+        (datetime.now(timezone.utc).isoformat(), row['id'])
+      )
+
+    page = build_task_page(row['task_name'], row['due_date'])
+    if ID_PROPERTY:
+      page['properties'][ID_PROPERTY] = {"rich_text": [{"text": {"content": row['id']}}]}
+    if not _renew(conn, row['id']):
+      return 'pending', "lease expired, left to another flusher"
+    response = client.create_page(page)
+    if response.status_code == 200:
+      url = task_url(response.json().get("id", ""))
+      _record_created(conn, row, url, attempts)
+      return 'done', url
+    error = response.json().get("message", f"HTTP {response.status_code}")
+    permanent = response.status_code in PERMANENT_STATUSES
+  except Exception as e:
+    error = str(e)
+    permanent = False
+
+  if permanent or attempts >= MAX_ATTEMPTS:
+    _finish(conn, row['id'], state='failed', attempts=attempts, last_error=error)
+    return 'failed', error
+  delay = min(RETRY_BASE_SECONDS * 2 ** (attempts - 1), RETRY_MAX_SECONDS)
+  _finish(conn, row['id'], attempts=attempts, last_error=error, next_attempt_at=time.time() + delay)
+  return 'pending', error
+
+def flush(path=SPOOL_PATH, notify=False, wait=True, verbose=False):
+  """Send every queued task, retrying until each one lands or fails for good.
+
+  With wait=False only tasks that are due right now are attempted. Returns
+  the number of tasks created.
+  """
+  from utils.notion import get_client
+
+  client = get_client()
+  created = 0
+  with closing(connect(path)) as conn:
+    while True:
+      row = _claim(conn)
+      if row is None:
+        if not wait:
+          break
+        next_due = conn.execute(
+          "SELECT MIN(MAX(next_attempt_at, COALESCE(lease_until, 0))) FROM tasks WHERE state = 'pending'"
+        ).fetchone()[0]
+        if next_due is None:
+          break
+        time.sleep(max(0.0, min(next_due - time.time(), RETRY_MAX_SECONDS)) + 0.05)
+        continue
+
+      state, detail = _send(conn, client, row)
+      if verbose:
+        print(f"{state:<8} {row['task_name']}: {detail}")
+      if state == 'done':
+        created += 1
+        if notify:
+          _notify(f"✅ {row['task_name']}", detail, url=detail)
+      elif state == 'failed' and notify:
+        _notify(f"❌ {row['task_name']}", f"Not added to Notion: {detail}")
+  return created
+
+def start_background_flush(path=SPOOL_PATH):
+  """Start a detached flusher process that notifies as each task lands."""
+  env = dict(os.environ, NOTION_SPOOL_PATH=path)
+  subprocess.Popen(
+    [sys.executable, '-m', 'utils.spool', 'flush', '--notify', '--quiet'],
+    cwd=REPO_DIR, env=env, start_new_session=True,
+    stdin=subprocess.DEVNULL, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL
+  )
+
+def _notify(title, message, url=None):
+  """Post a macOS notification (clickable through terminal-notifier when installed)."""
+  import shutil
+  from utils.applescript import quote
+
+  notifier = shutil.which('terminal-notifier')
+  try:
+    if notifier:
+      cmd = [notifier, '-title', title, '-message', message]
+      if url:
+        cmd += ['-open', url]
+      subprocess.run(cmd, check=False)
+    else:
+      subprocess.run(['osascript', '-e', f'display notification {quote(message)} with title {quote(title)}'], check=False)
+  except OSError:
+    pass
+
+# ------------------- CLI -------------------
+
+def list_tasks(path=SPOOL_PATH):
+  with closing(connect(path)) as conn:
+    rows = conn.execute("SELECT * FROM tasks ORDER BY created_at").fetchall()
+  if not rows:
+    print("Spool is empty")
+  for row in rows:
+    detail = row['url'] or row['last_error'] or ''
+    due = f" (due {row['due_date']})" if row['due_date'] else ''
+    print(f"{row['id'][:8]}  {row['state']:<8} {row['attempts']:>2}x  {row['task_name']}{due}  {detail}")
+
+def retry_failed(task_id=None, path=SPOOL_PATH):
+  """Requeue failed tasks (all of them, or those whose id starts with task_id)."""
+  with closing(connect(path)) as conn:
+    cursor = conn.execute(
+      "UPDATE tasks SET state = 'pending', attempts = 0, next_attempt_at = ? "
+      "WHERE state = 'failed' AND id LIKE ?",
+      (time.time(), f"{task_id or ''}%")
+    )
+  return cursor.rowcount
+
+def main():
+  import argparse
+
+  parser = argparse.ArgumentParser(description="Inspect and flush the Notion task spool")
+  commands = parser.add_subparsers(dest='command', required=True)
+  commands.add_parser('list')
+  flush_parser = commands.add_parser('flush')
+  flush_parser.add_argument('--notify', action='store_true', help='Post a notification for each task')
+  flush_parser.add_argument('--no-wait', action='store_true', help='Only try tasks that are due now')
+  flush_parser.add_argument('--quiet', action='store_true')
+  retry_parser = commands.add_parser('retry')
+  retry_parser.add_argument('id', nargs='?', help='Task id prefix (default: every failed task)')
+  args = parser.parse_args()
+
+  if args.command == 'list':
+    list_tasks()
+  elif args.command == 'flush':
+    created = flush(notify=args.notify, wait=not args.no_wait, verbose=not args.quiet)
+    if not args.quiet:
+      print(f"Created {created} task(s)")
+  elif args.command == 'retry':
+    print(f"Requeued {retry_failed(args.id)} task(s)")
+
+if __name__ == "__main__":
+  main()
@@ -0,0 +1,72 @@
+import re
+
+# ------------------- Text Chunking -------------------
+
+# Rough characters per token for English text, good enough for budgeting requests
+CHARS_PER_TOKEN = 4
+
+_PARAGRAPH_BREAK = re.compile(r'\n\s*\n')
+_SENTENCE_END = re.compile(r'[.!?…]+["\')\]]*\s+')
+_WHITESPACE = re.compile(r'\s+')
+
+def estimate_tokens(text):
+  """Approximate token count of text (no tokenizer needed)."""
+  return len(text) // CHARS_PER_TOKEN + 1
+
+def _split_after(pattern, text):
+  """Split text after each match of pattern, keeping the separators."""
+  pieces = []
+  start = 0
+  for match in pattern.finditer(text):
+    pieces.append(text[start:match.end()])
+    start = match.end()
+  if start < len(text):
+    pieces.append(text[start:])
+  return pieces
+
+def split_sentences(text, max_chars):
+  """Split text into sentences of at most max_chars characters.
+
+  A sentence longer than max_chars is split between words (only a single
+  word longer than that is cut). Each sentence keeps its trailing
+  whitespace, so ''.join(sentences) == text, and the last sentence of a
+  paragraph ends with the paragraph break.
+  """
+  sentences = []
+  for paragraph in _split_after(_PARAGRAPH_BREAK, text):
+    for sentence in _split_after(_SENTENCE_END, paragraph):
+      if len(sentence) <= max_chars:
+        sentences.append(sentence)
+        continue
+      sentences.extend(chunk_text(sentence, max_chars))
+  return sentences
+
+def chunk_text(text, max_chars):
+  """Split text into chunks of at most max_chars characters.
+
+  Breaks between paragraphs where it can, then between sentences, then
+  between words; only a single word longer than max_chars is cut. Each
+  chunk keeps its trailing whitespace, so ''.join(chunks) == text.
+  """
+  units = []
+  for paragraph in _split_after(_PARAGRAPH_BREAK, text):
+    if len(paragraph) <= max_chars:
+      units.append(paragraph)
+      continue
+    for sentence in _split_after(_SENTENCE_END, paragraph):
+      if len(sentence) <= max_chars:
+        units.append(sentence)
+        continue
+      for word in _split_after(_WHITESPACE, sentence):
+        units.extend(word[i:i + max_chars] for i in range(0, len(word), max_chars))
+
+  chunks = []
+  current = ''
+  for unit in units:
+    if current and len(current) + len(unit) > max_chars:
+      chunks.append(current)
+      current = ''
+    current += unit
+  if current:
+    chunks.append(current)
+  return chunks
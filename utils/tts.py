@@ -0,0 +1,342 @@
+"""Text-to-speech through OpenAI TTS, played while it downloads.
+
+Long text is split at sentence boundaries into request-sized pieces that are
+synthesized a few at a time and played back in order. Audio is streamed from
+the API and handed to a sink as it arrives, so playback starts after the
+first chunk of the first piece (the whole first piece, with afplay) while the
+following pieces are generated. The first piece is only the opening
+sentence or two, so even afplay starts after one short request.
+Each piece's audio is cached on disk by (text, voice, model). Pieces end at
+places picked by the text around them, not by where the text started, so
+replaying text, or text that overlaps something already read, skips the API
+for the pieces they share.
+
+Sinks:
+  ffplay - pipes MP3 into `ffplay` (brew install ffmpeg), plays as it streams
+  mpv    - pipes MP3 into `mpv`, plays as it streams
+  afplay - writes each piece to a temp file and plays it with the built-in
+           afplay once that piece is complete, while later pieces download
+  null   - plays nothing, records what it got and when (for tests)
+
+Pick one with RAYCAST_AUDIO_SINK, otherwise the first installed of ffplay,
+mpv and afplay.
+"""
+
+import functools
+import os
+import queue
+import re
+import shutil
+import subprocess
+import tempfile
+import threading
+import time
+import zlib
+from utils.env import REPO_DIR, getenv
+from utils.llm import get_client
+
+TTS_MODEL = "tts-1"
+TTS_VOICE = "alloy"
+
+# Bytes read from the API per chunk handed to the sink
+STREAM_CHUNK_SIZE = 4096
+
+# Characters per TTS request (the API allows 4096), and how many requests run
+# ahead of playback. Only that many pieces' audio is ever buffered.
+PIECE_CHARS = 1200
+MAX_CONCURRENT = 3
+
+# Pieces end at paragraph breaks and after the sentences whose hash picks
+# them, about one in PIECE_SENTENCES, so where a piece ends depends only on
+# the text there (like rsync's rolling-hash blocks): two overlapping texts
+# split into the same pieces from their first shared break on. PIECE_CHARS
+# still caps a piece when no break comes in time.
+PIECE_SENTENCES = 8
+
+# The first piece ends after the first sentence that takes it past this many
+# characters, so playback starts after a short request
+FIRST_PIECE_CHARS = 100
+
+_PARAGRAPH_END = re.compile(r'\n\s*\n\s*$')
+
+CACHE_PATH = os.getenv("TTS_CACHE_PATH", os.path.join(REPO_DIR, "tts-cache.sqlite3"))
+CACHE_MAX_BYTES = int(os.getenv("TTS_CACHE_MAX_BYTES", str(200 * 1024 * 1024)))
+CACHE_MAX_AGE = 90 * 24 * 3600
+
+# ------------------- Audio Sinks -------------------
+
+class AudioSink:
+  """Somewhere to send MP3 bytes as they arrive."""
+
+  def write(self, data):
+    raise NotImplementedError
+
+  def end_piece(self):
+    """Called after the last write of each piece."""
+
+  def close(self):
+    """Finish playing everything written, blocking until done."""
+
+  def abort(self):
+    """Stop and clean up without finishing playback."""
+
+class PlayerSink(AudioSink):
+  """Pipes audio into a player process that plays from stdin as it arrives."""
+
+  def __init__(self, cmd):
+    # Start the player now so it's ready by the time the first chunk arrives
+    self.process = subprocess.Popen(
+      cmd, stdin=subprocess.PIPE, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL
+    )
+
+  def write(self, data):
+    self.process.stdin.write(data)
+    self.process.stdin.flush()
+
+  def close(self):
+    self.process.stdin.close()
+    self.process.wait()
+
+  def abort(self):
+    self.process.kill()
+    self.process.wait()
+
+class FFplaySink(PlayerSink):
+  def __init__(self):
+    super().__init__(['ffplay', '-nodisp', '-autoexit', '-loglevel', 'quiet', '-i', '-'])
+
+class MpvSink(PlayerSink):
+  def __init__(self):
+    super().__init__(['mpv', '--no-video', '--really-quiet', '-'])
+
+class AfplaySink(AudioSink):
+  """Plays each piece with afplay (which can't read stdin) once its audio is complete.
+
+  Pieces are written to their own temp files and played in order on a
+  background thread, so piece N plays while pieces N+1.. are still
+  downloading.
+  """
+
+  def __init__(self):
+    self.file = None
+    self.finished = queue.Queue()  # paths of complete pieces, then None
+    self.lock = threading.Lock()
+    self.process = None
+    self.stopped = False
+    self.error = None
+    self.player = threading.Thread(target=self._play, daemon=True)
+    self.player.start()
+
+  def _play(self):
+    while (path := self.finished.get()) is not None:
+      try:
+        with self.lock:
+          if self.stopped:
+            continue
+          self.process = subprocess.Popen(['afplay', path])
+        if self.process.wait() != 0 and not self.stopped and self.error is None:
+          self.error = subprocess.CalledProcessError(self.process.returncode, 'afplay')
+      except OSError as e:
+        self.error = self.error or e
+      finally:
+        os.unlink(path)
+
+  def write(self, data):
+    if self.stopped:
+      return
+    if self.file is None:
+      self.file = tempfile.NamedTemporaryFile(suffix='.mp3', delete=False)
+    self.file.write(data)
+
+  def end_piece(self):
+    if self.file is not None:
+      self.file.close()
+      self.finished.put(self.file.name)
+      self.file = None
+
+  def close(self):
+    self.end_piece()
+    self.finished.put(None)
+    self.player.join()
+    if self.error:
+      raise self.error
+
+  def abort(self):
+    with self.lock:
+      self.stopped = True
+      if self.process and self.process.poll() is None:
+        self.process.kill()
+    if self.file is not None:
+      self.file.close()
+      os.unlink(self.file.name)
+      self.file = None
+    self.finished.put(None)
+    self.player.join()
+
+class NullSink(AudioSink):
+  """Plays nothing. Records the chunks and when the first one arrived."""
+
+  def __init__(self):
+    self.chunks = []
+    self.created_at = time.perf_counter()
+    self.first_write_at = None
+    self.closed = False
+
+  @property
+  def time_to_first_audio(self):
+    return None if self.first_write_at is None else self.first_write_at - self.created_at
+
+  def write(self, data):
+    if self.first_write_at is None:
+      self.first_write_at = time.perf_counter()
+    self.chunks.append(data)
+
+  def close(self):
+    self.closed = True
+
+SINKS = {
+  'ffplay': FFplaySink,
+  'mpv': MpvSink,
+  'afplay': AfplaySink,
+  'null': NullSink,
+}
+
+def open_sink():
+  """Start the configured sink, or the first installed streaming player."""
+  name = os.getenv('RAYCAST_AUDIO_SINK')
+  if name:
+    return SINKS[name]()
+  for name in ('ffplay', 'mpv'):
+    if shutil.which(name):
+      return SINKS[name]()
+  return AfplaySink()
+
+# ------------------- Text-to-Speech Functions -------------------
+
+def stream_speech(client, text, voice=TTS_VOICE, model=TTS_MODEL):
+  """Yield MP3 bytes for text as the API sends them."""
+  with client.audio.speech.with_streaming_response.create(
+    model=model, voice=voice, input=text, response_format="mp3"
+  ) as response:
+    yield from response.iter_bytes(STREAM_CHUNK_SIZE)
+
+def _ends_piece(sentence):
+  return bool(_PARAGRAPH_END.search(sentence)) or zlib.crc32(sentence.strip().encode()) % PIECE_SENTENCES == 0
+
+def split_for_speech(text, max_chars=PIECE_CHARS):
+  """Split text into pieces of at most max_chars, breaking between sentences.
+
+  The first piece is short (see FIRST_PIECE_CHARS); the rest end where
+  _ends_piece says, so the same text splits the same way wherever it starts.
+  """
+  from utils.text import split_sentences
+
+  pieces = []
+  current = ''
+  for sentence in split_sentences(text, max_chars):
+    if current.strip() and len(current) + len(sentence) > max_chars:
+      pieces.append(current)
+      current = ''
+    current += sentence
+    if not current.strip():
+      continue
+    if _ends_piece(sentence) or (not pieces and len(current.strip()) >= FIRST_PIECE_CHARS):
+      pieces.append(current)
+      current = ''
+  pieces.append(current)
+  return [piece.strip() for piece in pieces if piece.strip()]
+
+@functools.lru_cache(maxsize=None)
+def get_cache():
+  from utils.cache import DiskCache
+  return DiskCache(CACHE_PATH, max_bytes=CACHE_MAX_BYTES, max_age=CACHE_MAX_AGE)
+
+def _fetch(client, text, audio, stop, cache):
+  """Stream one piece's audio into a queue, ending with None (or the exception)."""
+  from utils.cache import cache_key
+
+  try:
+    key = cache_key(text, TTS_VOICE, TTS_MODEL) if cache else None
+    cached = get_cache().get(key) if key else None
+    if cached is not None:
+      audio.put(cached)
+      audio.put(None)
+      return
+
+    received = []
+    for data in stream_speech(client, text):
+      if stop.is_set():
+        return
+      received.append(data)
+      audio.put(data)
+    # Only complete audio is stored, in one transaction
+    if key:
+      get_cache().put(key, b''.join(received))
+    audio.put(None)
+  except Exception as e:
+    audio.put(e)
+
+def speak(client, pieces, sink, cache=True):
+  """Synthesize pieces concurrently and write their audio to sink in order.
+
+  Up to MAX_CONCURRENT pieces are requested ahead of the one being played,
+  and the piece being played is written as it streams in, followed by
+  sink.end_piece(). With cache=True
+  pieces heard before are read from the disk cache instead of the API.
+  """
+  from concurrent.futures import ThreadPoolExecutor
+
+  stop = threading.Event()
+  audio_queues = []
+  with ThreadPoolExecutor(max_workers=MAX_CONCURRENT) as pool:
+    def start(index):
+      audio = queue.Queue()
+      audio_queues.append(audio)
+      pool.submit(_fetch, client, pieces[index], audio, stop, cache)
+
+    try:
+      for index in range(min(MAX_CONCURRENT, len(pieces))):
+        start(index)
+      for index in range(len(pieces)):
+        audio = audio_queues[index]
+        while True:
+          data = audio.get()
+          if data is None:
+            break
+          if isinstance(data, Exception):
+            raise data
+          sink.write(data)
+        sink.end_piece()
+        audio_queues[index] = None
+        if index + MAX_CONCURRENT < len(pieces):
+          start(index + MAX_CONCURRENT)
+    finally:
+      stop.set()
+
+def text_to_speech(text, sink=None, cache=True):
+  """Convert text to speech using OpenAI TTS and play it as it streams in."""
+  # Get API key from environment
+  api_key = getenv("OPENAI_API_KEY")
+  if not api_key:
+    print("Error: OPENAI_API_KEY not found in environment")
+    return False
+
+  if not text or not text.strip():
+    print("Error: No text to convert to speech")
+    return False
+
+  try:
+    sink = sink or open_sink()
+  except OSError as e:
+    print(f"Error starting audio player: {str(e)}")
+    return False
+
+  try:
+    speak(get_client(api_key), split_for_speech(text), sink, cache)
+    sink.close()
+    return True
+
+  except Exception as e:
+    print(f"Error converting text to speech: {str(e)}")
+    sink.abort()
+    return False